@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from asyncio import sleep
+from collections.abc import Awaitable, Callable
+from time import monotonic
 from typing import Any, cast
 
+from aioecopanel import EcoPanelConnectionTimeoutError, EcoPanelError
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -19,32 +23,68 @@ from homeassistant.core import (
     ServiceResponse,
     SupportsResponse,
 )
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntry
 
 from .const import (
+    ATTR_ADDRESS,
+    ATTR_AREA_ID,
+    ATTR_DEVICE,
+    ATTR_DEVICES,
+    ATTR_DURATION,
     ATTR_INDEX,
+    ATTR_MAX_AGE,
+    ATTR_MIN_PRIORITY,
+    ATTR_NAME,
+    ATTR_OBJECT_TYPES,
+    ATTR_OBJECT,
+    ATTR_OBJECTS,
+    ATTR_PAGE_SIZE,
     ATTR_PRIORITY,
     ATTR_PROPERTY,
+    ATTR_REMOVE,
+    ATTR_STATE_INTERVAL,
+    ATTR_STATISTICS_ONLY,
+    ATTR_STOP_TRACING,
+    ATTR_TOP,
     ATTR_VALUE,
+    ATTR_WAIT_FOR_CONFIRMATION,
     DOMAIN,
+    IMPORT_TREND_LOG_SCHEMA,
+    IMPORT_TREND_LOG_SERVICE_NAME,
+    LANE_BULK,
+    LANE_INTERACTIVE,
     LOGGER,
+    MEMORY_SNAPSHOT_SCHEMA,
+    MEMORY_SNAPSHOT_SERVICE_NAME,
+    OVERRIDE_REPORT_SCHEMA,
+    OVERRIDE_REPORT_SERVICE_NAME,
+    PROFILE_START_SCHEMA,
+    PROFILE_START_SERVICE_NAME,
+    PROFILE_STOP_SCHEMA,
+    PROFILE_STOP_SERVICE_NAME,
+    READ_PROPERTIES_SCHEMA,
+    READ_PROPERTIES_SERVICE_NAME,
+    READ_PROPERTY_SCHEMA,
+    READ_PROPERTY_SERVICE_NAME,
+    READ_PRIORITY_ARRAY_SCHEMA,
+    READ_PRIORITY_ARRAY_SERVICE_NAME,
+    RESTORE_SETPOINTS_SCHEMA,
+    RESTORE_SETPOINTS_SERVICE_NAME,
+    SET_STATISTICS_MODE_SCHEMA,
+    SET_STATISTICS_MODE_SERVICE_NAME,
+    SNAPSHOT_SETPOINTS_SCHEMA,
+    SNAPSHOT_SETPOINTS_SERVICE_NAME,
     WRITE_PROPERTY_SCHEMA,
     WRITE_PROPERTY_SERVICE_NAME,
     WRITE_RELEASE_SCHEMA,
     WRITE_RELEASE_SERVICE_NAME,
 )
 from .coordinator import EcoPanelDataUpdateCoordinator
-
-# List of platforms to support. There should be a matching .py file for each,
-# eg <cover.py> and <sensor.py>
-PLATFORMS: list[str] = [
-    "binary_sensor",
-    "sensor",
-    "number",
-    "switch",
-    "select",
-]
+from .helper import active_priority
+from .snapshots import SetpointSnapshots
+from .trendlog import TrendLogBackfill
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -61,12 +101,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
+    # Entities only refer to their device, so it has to exist before them.
+    coordinator.async_register_devices()
+
     # This creates each HA object for each platform your device requires.
     # It's done by calling the `async_setup_entry` function in each platform module.
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Only the platforms of the object types on the site are set up, others
+    # follow once objects of their types show up.
+    await coordinator.async_setup_platforms()
 
     # Reload entry when its updated.
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(coordinator.statistics.async_start())
 
     entry.async_create_background_task(
         hass,
@@ -74,36 +120,74 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         name="bacnet-monitor-data",
     )
 
-    async def write_release(call: ServiceCall) -> ServiceResponse:
-        """Write empty presentValue that serves to release higher priority write request."""
+    entry.async_on_unload(coordinator.addresses.async_start())
 
-        entity_registry = er.async_get(hass)
+    trend_log_backfill = TrendLogBackfill(hass, coordinator)
+    setpoint_snapshots = SetpointSnapshots(hass, coordinator)
 
-        entity_data = entity_registry.async_get(call.data[ATTR_ENTITY_ID][0])
-        assert entity_data is not None
+    def resolve_targets(call: ServiceCall) -> list[tuple[str | None, str, str]]:
+        """Return the entity, device and object of every target of a call."""
 
-        device_id, object_id = entity_data.unique_id.split("_")
+        targets: list[tuple[str | None, str, str]] = []
 
-        if call.data.get(ATTR_PRIORITY):
-            LOGGER.warning(
-                "Priority is currently not functioning. Writing default value."
+        for entity_id in call.data.get(ATTR_ENTITY_ID) or []:
+            if (address := coordinator.addresses.address(entity_id)) is None:
+                raise ServiceValidationError(f"{entity_id} is not a BACnet entity")
+            targets.append((entity_id, *address))
+
+        for device_id, object_id in call.data.get(ATTR_ADDRESS, []):
+            targets.append(
+                (coordinator.addresses.entity_id(device_id, object_id), device_id, object_id)
             )
 
-        await coordinator.interface.write_property(
-            deviceid=device_id, objectid=object_id
+        return targets
+
+    async def run_writes(
+        call: ServiceCall,
+        write: Callable[[str, str, float | None, str], Awaitable[float | None]],
+    ) -> ServiceResponse:
+        """Write to every target of a call, through the bulk lane when there are many."""
+
+        targets = resolve_targets(call)
+        lane = LANE_BULK if len(targets) > 1 else LANE_INTERACTIVE
+        wait = call.data.get(ATTR_WAIT_FOR_CONFIRMATION)
+        timeout = wait.total_seconds() if wait is not None else None
+
+        results = await asyncio.gather(
+            *(
+                write(device_id, object_id, timeout, lane)
+                for _, device_id, object_id in targets
+            ),
+            return_exceptions=True,
         )
 
+        confirmations: dict[str, float] = {}
+
+        for (_, device_id, object_id), result in zip(targets, results):
+            if isinstance(result, EcoPanelConnectionTimeoutError):
+                raise HomeAssistantError(str(result)) from result
+            if isinstance(result, BaseException):
+                raise result
+            if result is not None:
+                confirmations[f"{device_id}/{object_id}"] = round(result, 3)
+
+        if wait is not None:
+            return {"status": "successfull!", "confirmations": confirmations}
+
         return {"status": "successfull!"}
 
-    async def write_property(call: ServiceCall) -> ServiceResponse:
-        """Write property with value to an object."""
+    async def write_release(call: ServiceCall) -> ServiceResponse:
+        """Write empty presentValue that serves to release higher priority write request."""
 
-        entity_registry = er.async_get(hass)
+        if call.data.get(ATTR_PRIORITY):
+            LOGGER.warning(
+                "Priority is currently not functioning. Writing default value."
+            )
 
-        entity_data = entity_registry.async_get(call.data[ATTR_ENTITY_ID][0])
-        assert entity_data is not None
+        return await run_writes(call, coordinator.async_write_release)
 
-        device_id, object_id = entity_data.unique_id.split("_")
+    async def write_property(call: ServiceCall) -> ServiceResponse:
+        """Write property with value to an object."""
 
         if priority := call.data.get(ATTR_PRIORITY):
             pass
@@ -117,16 +201,221 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if array_index := call.data.get(ATTR_INDEX):
             pass
 
-        await coordinator.interface.write_property_v2(
-            deviceid=device_id,
-            objectid=object_id,
-            propertyid=property_id,
-            value=value,
-            array_index=array_index,
-            priority=priority,
+        return await run_writes(
+            call,
+            lambda device_id, object_id, timeout, lane: coordinator.async_write_property(
+                deviceid=device_id,
+                objectid=object_id,
+                propertyid=property_id,
+                value=value,
+                array_index=array_index,
+                priority=priority,
+                wait_for_confirmation=timeout,
+                lane=lane,
+            ),
         )
 
-        return {"status": "successfull!"}
+    async def read_properties(call: ServiceCall) -> ServiceResponse:
+        """Read properties of many objects at once from the coordinator data."""
+
+        # (entity_id, device_id, object_id, property_id) for every requested value
+        requests: list[tuple[str | None, str, str, str]] = [
+            (entity_id, device_id, object_id, call.data[ATTR_PROPERTY])
+            for entity_id, device_id, object_id in resolve_targets(call)
+        ]
+
+        for item in call.data.get(ATTR_OBJECTS, []):
+            requests.append(
+                (None, item[ATTR_DEVICE], item[ATTR_OBJECT], item[ATTR_PROPERTY])
+            )
+
+        if (max_age := call.data.get(ATTR_MAX_AGE)) is not None:
+            # Only refresh the objects whose data is older than requested.
+            threshold = monotonic() - max_age.total_seconds()
+            await coordinator.async_refresh_objects(
+                (device_id, object_id)
+                for _, device_id, object_id, _ in requests
+                if (record := coordinator.records.get(device_id, {}).get(object_id))
+                is None
+                or record.last_update < threshold
+            )
+
+        now = monotonic()
+        results: list[dict[str, Any]] = []
+
+        for entity_id, device_id, object_id, property_id in requests:
+            result: dict[str, Any] = {
+                ATTR_DEVICE: device_id,
+                ATTR_OBJECT: object_id,
+                ATTR_PROPERTY: property_id,
+                ATTR_VALUE: None,
+            }
+            if entity_id is not None:
+                result[ATTR_ENTITY_ID] = entity_id
+
+            try:
+                obj = coordinator.data.devices[device_id].objects[object_id]
+                result[ATTR_VALUE] = getattr(obj, property_id)
+                result["age"] = round(
+                    now - coordinator.records[device_id][object_id].last_update, 1
+                )
+            except (KeyError, AttributeError):
+                pass
+
+            results.append(result)
+
+        return {"results": results}
+
+    async def read_property(call: ServiceCall) -> ServiceResponse:
+        """Read any property of an object, answered from cache when possible."""
+
+        if ATTR_DEVICE in call.data:
+            device_id, object_id = call.data[ATTR_DEVICE], call.data[ATTR_OBJECT]
+        else:
+            _, device_id, object_id = resolve_targets(call)[0]
+
+        max_age = call.data.get(ATTR_MAX_AGE)
+
+        try:
+            value = await coordinator.async_read_property(
+                device_id,
+                object_id,
+                call.data[ATTR_PROPERTY],
+                call.data.get(ATTR_INDEX),
+                max_age.total_seconds() if max_age is not None else None,
+            )
+        except EcoPanelError as err:
+            raise HomeAssistantError(
+                f"Reading {call.data[ATTR_PROPERTY]} of {device_id}/{object_id} failed: {err}"
+            ) from err
+
+        return {
+            ATTR_DEVICE: device_id,
+            ATTR_OBJECT: object_id,
+            ATTR_PROPERTY: call.data[ATTR_PROPERTY],
+            ATTR_VALUE: value,
+        }
+
+    async def import_trend_log(call: ServiceCall) -> ServiceResponse:
+        """Import the buffer of a trend log into the statistics of an entity."""
+
+        entity_id = call.data[ATTR_ENTITY_ID]
+
+        if (device_id := call.data.get(ATTR_DEVICE)) is None:
+            if (address := coordinator.addresses.address(entity_id)) is None:
+                raise ServiceValidationError(
+                    f"Give the device of the trend log, {entity_id} is not a BACnet entity"
+                )
+
+            device_id, _ = address
+
+        try:
+            return await trend_log_backfill.async_import(
+                entity_id, device_id, call.data[ATTR_OBJECT], call.data[ATTR_PAGE_SIZE]
+            )
+        except EcoPanelError as err:
+            raise HomeAssistantError(
+                f"Reading trend log {device_id}/{call.data[ATTR_OBJECT]} failed: {err}"
+            ) from err
+
+    async def read_priority_array(call: ServiceCall) -> ServiceResponse:
+        """Read the priorityArray of entities and show it on them."""
+
+        max_age = call.data.get(ATTR_MAX_AGE)
+        results: dict[str, Any] = {}
+
+        for entity_id, device_id, object_id in resolve_targets(call):
+            try:
+                slots = await coordinator.async_read_priority_array(
+                    device_id,
+                    object_id,
+                    max_age.total_seconds() if max_age is not None else None,
+                )
+            except EcoPanelError as err:
+                raise HomeAssistantError(
+                    f"Reading priorityArray of {device_id}/{object_id} failed: {err}"
+                ) from err
+
+            results[entity_id or f"{device_id}/{object_id}"] = {
+                "priority": active_priority(slots),
+                "slots": slots,
+            }
+
+        return {"results": results}
+
+    async def override_report(call: ServiceCall) -> ServiceResponse:
+        """Report which objects of a device are overridden at which priority."""
+
+        if call.data[ATTR_DEVICE] not in coordinator.data.devices:
+            raise ServiceValidationError(f"Unknown device: {call.data[ATTR_DEVICE]}")
+
+        return await coordinator.async_override_report(
+            call.data[ATTR_DEVICE], call.data[ATTR_MIN_PRIORITY]
+        )
+
+    async def snapshot_setpoints(call: ServiceCall) -> ServiceResponse:
+        """Capture the present values of the setpoints that match a filter."""
+
+        return await setpoint_snapshots.async_snapshot(
+            call.data[ATTR_NAME],
+            call.data.get(ATTR_DEVICES),
+            call.data.get(ATTR_OBJECT_TYPES),
+            call.data.get(ATTR_AREA_ID),
+        )
+
+    async def restore_setpoints(call: ServiceCall) -> ServiceResponse:
+        """Write the values of a snapshot back to the setpoints."""
+
+        return await setpoint_snapshots.async_restore(
+            call.data[ATTR_NAME], call.data[ATTR_REMOVE]
+        )
+
+    async def set_statistics_mode(call: ServiceCall) -> None:
+        """Switch points between normal states and statistics only."""
+
+        entity_registry = er.async_get(hass)
+
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            entity_data = entity_registry.async_get(entity_id)
+            if entity_data is None or entity_data.platform != DOMAIN:
+                raise ServiceValidationError(f"{entity_id} is not a BACnet entity")
+            if entity_data.domain != "sensor":
+                raise ServiceValidationError(
+                    f"Statistics mode is only supported by sensors, not {entity_id}"
+                )
+
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            options: dict[str, Any] | None = None
+
+            if call.data[ATTR_STATISTICS_ONLY]:
+                options = {ATTR_STATISTICS_ONLY: True}
+                if (interval := call.data.get(ATTR_STATE_INTERVAL)) is not None:
+                    options[ATTR_STATE_INTERVAL] = interval.total_seconds()
+
+            entity_registry.async_update_entity_options(entity_id, DOMAIN, options)
+
+    async def profile_start(call: ServiceCall) -> None:
+        """Profile the message handling for a while."""
+
+        if coordinator.profiler.running:
+            raise ServiceValidationError("A profiling session is already running")
+
+        coordinator.profiler.async_start(call.data[ATTR_DURATION])
+
+    async def profile_stop(call: ServiceCall) -> ServiceResponse:
+        """Stop profiling the message handling and write the profile."""
+
+        if not coordinator.profiler.running:
+            raise ServiceValidationError("No profiling session is running")
+
+        return await coordinator.profiler.async_stop()
+
+    async def memory_snapshot(call: ServiceCall) -> ServiceResponse:
+        """Report the memory of the integration and its growth since last time."""
+
+        return await coordinator.memory.async_snapshot(
+            call.data[ATTR_TOP], call.data[ATTR_STOP_TRACING]
+        )
 
     hass.services.async_register(
         DOMAIN,
@@ -142,6 +431,81 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         schema=WRITE_PROPERTY_SCHEMA,
         supports_response=SupportsResponse.OPTIONAL,
     )
+    hass.services.async_register(
+        DOMAIN,
+        READ_PROPERTIES_SERVICE_NAME,
+        read_properties,
+        schema=READ_PROPERTIES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        READ_PROPERTY_SERVICE_NAME,
+        read_property,
+        schema=READ_PROPERTY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        IMPORT_TREND_LOG_SERVICE_NAME,
+        import_trend_log,
+        schema=IMPORT_TREND_LOG_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        READ_PRIORITY_ARRAY_SERVICE_NAME,
+        read_priority_array,
+        schema=READ_PRIORITY_ARRAY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        OVERRIDE_REPORT_SERVICE_NAME,
+        override_report,
+        schema=OVERRIDE_REPORT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SNAPSHOT_SETPOINTS_SERVICE_NAME,
+        snapshot_setpoints,
+        schema=SNAPSHOT_SETPOINTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        RESTORE_SETPOINTS_SERVICE_NAME,
+        restore_setpoints,
+        schema=RESTORE_SETPOINTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SET_STATISTICS_MODE_SERVICE_NAME,
+        set_statistics_mode,
+        schema=SET_STATISTICS_MODE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        PROFILE_START_SERVICE_NAME,
+        profile_start,
+        schema=PROFILE_START_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        PROFILE_STOP_SERVICE_NAME,
+        profile_stop,
+        schema=PROFILE_STOP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        MEMORY_SNAPSHOT_SERVICE_NAME,
+        memory_snapshot,
+        schema=MEMORY_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
     return True
 
@@ -171,9 +535,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # This is called when an entry/configured device is to be removed. The class
     # needs to unload itself, and remove callbacks. See the classes for further
     # details
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
+    ):
         await coordinator.interface.disconnect()
         if coordinator.unsub:
             coordinator.unsub()
@@ -197,6 +563,7 @@ async def async_remove_config_entry_device(
                 f"(Removing device {coordinator.data.devices.get(device_id)}"
             )
             coordinator.data.devices.pop(device_id)
+            coordinator.records.pop(device_id, None)
         except KeyError:
             continue
 
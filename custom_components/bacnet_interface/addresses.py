@@ -0,0 +1,107 @@
+"""Index between entity IDs and the BACnet objects they represent."""
+
+from __future__ import annotations
+
+from collections.abc import Container
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+if TYPE_CHECKING:
+    from .coordinator import EcoPanelDataUpdateCoordinator
+
+# (deviceid, objectid)
+type BACnetAddress = tuple[str, str]
+
+
+def parse_unique_id(
+    unique_id: str, deviceids: Container[str]
+) -> BACnetAddress | None:
+    """Split a unique ID into the device and object it was made of.
+
+    Unique IDs are "<deviceid>_<objectid>", so split at the underscore after
+    which the first part is a known device. IDs may contain underscores too.
+    """
+    index = unique_id.find("_")
+
+    while index != -1:
+        if unique_id[:index] in deviceids:
+            return unique_id[:index], unique_id[index + 1 :]
+        index = unique_id.find("_", index + 1)
+
+    return None
+
+
+class EntityAddressIndex:
+    """Bidirectional index of entity IDs and BACnet addresses of a config entry.
+
+    Built once from the entity registry and kept up to date from registry
+    events, so services do not need a registry lookup per target.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: EcoPanelDataUpdateCoordinator
+    ) -> None:
+        """Initialize an empty index."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._addresses: dict[str, BACnetAddress] = {}
+        self._entity_ids: dict[BACnetAddress, str] = {}
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Index the registered entities and follow registry changes."""
+        registry = er.async_get(self.hass)
+        entry_id = self.coordinator.config_entry.entry_id
+
+        for entry in er.async_entries_for_config_entry(registry, entry_id):
+            self._add(entry)
+
+        return self.hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+        )
+
+    def _add(self, entry: er.RegistryEntry) -> None:
+        """Add a registry entry to the index."""
+        address = parse_unique_id(entry.unique_id, self.coordinator.data.devices)
+        if address is None:
+            return
+
+        self._addresses[entry.entity_id] = address
+        self._entity_ids[address] = entry.entity_id
+
+    def _remove(self, entity_id: str) -> None:
+        """Remove an entity from the index."""
+        if (address := self._addresses.pop(entity_id, None)) is not None:
+            if self._entity_ids.get(address) == entity_id:
+                del self._entity_ids[address]
+
+    @callback
+    def _async_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Follow entities that are created, renamed or removed."""
+        data = event.data
+
+        if data["action"] == "remove":
+            self._remove(data["entity_id"])
+            return
+
+        if data["action"] == "update":
+            self._remove(data.get("old_entity_id", data["entity_id"]))
+
+        entry = er.async_get(self.hass).async_get(data["entity_id"])
+        if (
+            entry is not None
+            and entry.config_entry_id == self.coordinator.config_entry.entry_id
+        ):
+            self._add(entry)
+
+    def address(self, entity_id: str) -> BACnetAddress | None:
+        """Return the BACnet address of an entity."""
+        return self._addresses.get(entity_id)
+
+    def entity_id(self, deviceid: str, objectid: str) -> str | None:
+        """Return the entity of a BACnet address."""
+        return self._entity_ids.get((deviceid, objectid))
@@ -1,15 +1,15 @@
-from typing import Any
+from collections.abc import Iterator
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ENABLED, CONF_NAME
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, LOGGER
 from .coordinator import EcoPanelDataUpdateCoordinator
+from .entity import EcoPanelEntity, async_add_entities_chunked
 
 
 async def async_setup_entry(
@@ -19,15 +19,21 @@ async def async_setup_entry(
 ) -> None:
     """Set up EcoPanel sensor based on a config entry."""
     coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entity_list: list[Entity] = []
 
-    # Collect from all devices the objects that can become a binary sensor
-    for deviceid in coordinator.data.devices:
+    await async_add_entities_chunked(
+        coordinator, async_add_entities, _entities(coordinator)
+    )
+
+
+def _entities(coordinator: EcoPanelDataUpdateCoordinator) -> Iterator[Entity]:
+    """Yield an entity for every object that can become a binary sensor."""
+    # Copied, as messages may add devices and objects between the chunks.
+    for deviceid in list(coordinator.data.devices):
         if not coordinator.data.devices[deviceid].objects:
             LOGGER.warning(f"No objects in {deviceid}!")
             continue
 
-        for objectid in coordinator.data.devices[deviceid].objects:
+        for objectid in list(coordinator.data.devices[deviceid].objects):
             if (
                 not coordinator.data.devices[deviceid]
                 .objects[objectid]
@@ -39,17 +45,12 @@ async def async_setup_entry(
                 coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
                 == "binaryInput"
             ):
-                entity_list.append(
-                    BinaryInputEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield BinaryInputEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
-    async_add_entities(entity_list)
 
 
-class BinaryInputEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], BinarySensorEntity
-):
+class BinaryInputEntity(EcoPanelEntity, BinarySensorEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -59,9 +60,7 @@ class BinaryInputEntity(
         objectid: str,
     ):
         """Initialize a BACnet Binary Input object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
 
     @property
     def unique_id(self) -> str:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -89,61 +88,8 @@ class BinaryInputEntity(
 
     @property
     def is_on(self) -> bool | None:  # pyright: ignore[reportIncompatibleMethodOverride]
-        if (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-            == "active"
-        ):
-            return True
-        elif (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-            == "inactive"
-        ):
-            return False
-        else:
-            return None
+        return self.record.value
 
     @property
     def icon(self):  # pyright: ignore[reportIncompatibleMethodOverride]
         return "mdi:lightbulb-outline"
-
-    @property
-    def device_info(self) -> DeviceInfo:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
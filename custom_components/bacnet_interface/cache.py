@@ -0,0 +1,169 @@
+"""Read-through cache for BACnet properties read through the add-on."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from sys import getsizeof
+from time import monotonic
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+# (deviceid, objectid, propertyid, array_index)
+type CacheKey = tuple[str, str, str, int | None]
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory used by a decoded JSON value."""
+    size = getsizeof(value)
+
+    if isinstance(value, dict):
+        for key, item in value.items():  # pyright: ignore[reportUnknownVariableType]
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, list | tuple):
+        for item in value:  # pyright: ignore[reportUnknownVariableType]
+            size += estimate_size(item)
+
+    return size
+
+
+class PropertyCache:
+    """LRU cache of property values with a TTL and a memory cap.
+
+    Identical reads that arrive while a value is being fetched share the
+    same request. Values of an object are invalidated when a COV or a write
+    for that object is seen. Fetches run as background tasks of the config
+    entry, so they are cancelled when it unloads.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        default_ttl: float,
+        max_bytes: int,
+        ttls: Mapping[str, float] | None = None,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.hass = hass
+        self.entry = entry
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.ttls = ttls or {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+        # Least recently used first: key -> (expires, size, value)
+        self._entries: OrderedDict[CacheKey, tuple[float, int, Any]] = OrderedDict()
+        self._object_keys: dict[tuple[str, str], set[CacheKey]] = {}
+        self._in_flight: dict[CacheKey, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached values."""
+        return len(self._entries)
+
+    def peek(self, key: CacheKey) -> Any:
+        """Return a cached value if it is still fresh, without fetching it."""
+        if (entry := self._entries.get(key)) is None or entry[0] <= monotonic():
+            return None
+
+        return entry[2]
+
+    async def async_get(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Awaitable[Any]],
+        max_age: float | None = None,
+    ) -> Any:
+        """Return a cached value, fetching it if missing or expired."""
+        if (entry := self._entries.get(key)) is not None:
+            expires, _, value = entry
+            ttl = self.ttls.get(key[2], self.default_ttl)
+            fresh = expires > monotonic()
+            if fresh and max_age is not None:
+                fresh = expires - ttl + max_age > monotonic()
+            if fresh:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if (task := self._in_flight.get(key)) is None:
+            self.misses += 1
+            # Not started eagerly, the task must be in flight before it stores.
+            task = self.entry.async_create_background_task(
+                self.hass,
+                self._async_load(key, fetch),
+                f"bacnet-read-{key[0]}-{key[1]}-{key[2]}",
+                eager_start=False,
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._load_done(key, done))
+
+        return await asyncio.shield(task)
+
+    async def _async_load(
+        self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Fetch a value and store it, unless it was invalidated meanwhile."""
+        value = await fetch()
+
+        if self._in_flight.get(key) is asyncio.current_task():
+            self._store(key, value)
+
+        return value
+
+    def _load_done(self, key: CacheKey, task: asyncio.Task[Any]) -> None:
+        """Forget a finished fetch."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        if not task.cancelled():
+            # Mark the exception as retrieved, the waiters have their own copy.
+            task.exception()
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        """Store a value and evict the least recently used ones over the cap."""
+        self._remove(key)
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        expires = monotonic() + self.ttls.get(key[2], self.default_ttl)
+        self._entries[key] = (expires, size, value)
+        self._object_keys.setdefault((key[0], key[1]), set()).add(key)
+        self.size += size
+
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove a single value from the cache."""
+        if (entry := self._entries.pop(key, None)) is None:
+            return
+
+        self.size -= entry[1]
+        object_keys = self._object_keys[(key[0], key[1])]
+        object_keys.discard(key)
+        if not object_keys:
+            del self._object_keys[(key[0], key[1])]
+
+    def invalidate_object(self, deviceid: str, objectid: str) -> None:
+        """Drop all values of an object, including reads still in flight."""
+        for key in list(self._object_keys.get((deviceid, objectid), ())):
+            self._remove(key)
+
+        if self._in_flight:
+            for key in [k for k in self._in_flight if k[:2] == (deviceid, objectid)]:
+                del self._in_flight[key]
+
+    def clear(self) -> None:
+        """Drop all cached values."""
+        self._entries.clear()
+        self._object_keys.clear()
+        self._in_flight.clear()
+        self.size = 0
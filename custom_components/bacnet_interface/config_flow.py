@@ -34,8 +34,12 @@ from .const import (
     CONF_ANALOG_VALUE,
     CONF_BINARY_OUTPUT,
     CONF_BINARY_VALUE,
+    CONF_COALESCE_WINDOW,
+    CONF_LOOP_WATCHDOG,
     CONF_MULTISTATE_OUTPUT,
     CONF_MULTISTATE_VALUE,
+    CONF_WRITE_CONFIRMATION,
+    DEFAULT_COALESCE_WINDOW,
     DOMAIN,
     LOGGER,
     NAME_OPTIONS,
@@ -44,6 +48,18 @@ from .const import (
 
 _LOGGER = LOGGER
 
+COALESCE_WINDOW_SELECTOR: Selector[Any] = selector(
+    {
+        "number": {
+            "min": 0,
+            "max": 250,
+            "step": 10,
+            "unit_of_measurement": "ms",
+            "mode": "box",
+        }
+    }
+)
+
 
 class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for the EcoPanel."""
@@ -120,6 +136,22 @@ class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
                             "suggested_value": self.options.get(CONF_PORT, 8099)
                         },
                     ): int,
+                    vol.Required(
+                        CONF_COALESCE_WINDOW,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                            )
+                        },
+                    ): COALESCE_WINDOW_SELECTOR,
+                    vol.Required(
+                        CONF_LOOP_WATCHDOG,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_LOOP_WATCHDOG, False
+                            )
+                        },
+                    ): bool,
                 }
             ),
             errors=errors,
@@ -193,6 +225,17 @@ class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
                 }
             }
         )
+        confirmation_selector: Selector[Any] = selector(
+            {
+                "number": {
+                    "min": 0,
+                    "max": 60,
+                    "step": 0.5,
+                    "unit_of_measurement": "s",
+                    "mode": "box",
+                }
+            }
+        )
 
         return self.async_show_form(
             step_id="writing",
@@ -246,6 +289,14 @@ class EcoPanelConfigFlow(ConfigFlow, domain=DOMAIN):
                             )
                         },
                     ): write_selector,
+                    vol.Required(
+                        CONF_WRITE_CONFIRMATION,
+                        description={
+                            "suggested_value": self.options.get(
+                                CONF_WRITE_CONFIRMATION, 0
+                            )
+                        },
+                    ): confirmation_selector,
                 }
             ),
         )
@@ -317,6 +368,22 @@ class OptionsFlowHandler(OptionsFlow):
                             )
                         },
                     ): int,
+                    vol.Required(
+                        CONF_COALESCE_WINDOW,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                            )
+                        },
+                    ): COALESCE_WINDOW_SELECTOR,
+                    vol.Required(
+                        CONF_LOOP_WATCHDOG,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_LOOP_WATCHDOG, False
+                            )
+                        },
+                    ): bool,
                 }
             ),
             errors=errors,
@@ -390,6 +457,17 @@ class OptionsFlowHandler(OptionsFlow):
                 }
             }
         )
+        confirmation_selector: Selector[Any] = selector(
+            {
+                "number": {
+                    "min": 0,
+                    "max": 60,
+                    "step": 0.5,
+                    "unit_of_measurement": "s",
+                    "mode": "box",
+                }
+            }
+        )
 
         return self.async_show_form(
             step_id="writing",
@@ -443,6 +521,14 @@ class OptionsFlowHandler(OptionsFlow):
                             )
                         },
                     ): write_selector,
+                    vol.Required(
+                        CONF_WRITE_CONFIRMATION,
+                        description={
+                            "suggested_value": self.config_entry.data.get(
+                                CONF_WRITE_CONFIRMATION, 0
+                            )
+                        },
+                    ): confirmation_selector,
                 }
             ),
         )
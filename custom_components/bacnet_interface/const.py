@@ -2,6 +2,7 @@
 
 import logging
 from datetime import timedelta
+from typing import Any
 
 import voluptuous as vol
 from homeassistant.const import ATTR_ENTITY_ID
@@ -13,6 +14,26 @@ DOMAIN = "bacnet_interface"
 
 LOGGER = logging.getLogger(__package__)
 SCAN_INTERVAL = timedelta(seconds=60)
+STORAGE_VERSION = 1
+
+# How long the websocket may be down before silent devices become unavailable.
+# Longer than SCAN_INTERVAL, so a reconnect attempt happens within the period.
+WEBSOCKET_GRACE_PERIOD = timedelta(seconds=90)
+
+# Objects with entities that had no update for this long are refreshed through
+# the add-on API, and flagged stale when that brings no update either. The
+# first deadline of every object gets up to OBJECT_STALE_JITTER on top, so the
+# objects added at setup are not refreshed all at once. Objects whose deadlines
+# are this many seconds apart are refreshed together. Objects whose refresh
+# brings back the same value are checked again at doubling intervals, up to
+# OBJECT_STALE_MAX_INTERVAL.
+OBJECT_STALE_TIMEOUT = timedelta(minutes=30)
+OBJECT_STALE_JITTER = timedelta(minutes=15)
+OBJECT_STALE_MAX_INTERVAL = timedelta(hours=4)
+OBJECT_STALE_CHECK_SLACK = 5
+
+DEVICE_UNAVAILABLE_SYSTEM_STATUS = {"nonOperational"}
+DEVICE_UNAVAILABLE_RELIABILITY = {"communicationFailure"}
 
 STATETEXT_OFFSET = 1  # JCO
 
@@ -22,35 +43,308 @@ WRITE_OPTIONS = ["presentValue", "relinquishDefault"]
 
 
 def entity_ids_validator(value: str | list[str]):
-    cv.entity_ids(value)  # type: ignore
+    return cv.entity_ids(value)  # type: ignore
+
+
+def bacnet_address(value: Any) -> tuple[str, str]:
+    """Validate a BACnet address like device:1001/analogValue:3."""
+    deviceid, separator, objectid = cv.string(value).partition("/")
+
+    if not separator or not deviceid.strip() or not objectid.strip():
+        raise vol.Invalid(
+            f"Invalid BACnet address {value}, expected for example device:1001/analogValue:3"
+        )
+
+    return deviceid.strip(), objectid.strip()
+
+
+ATTR_ADDRESS = "address"
+BACNET_ADDRESSES = vol.All(cv.ensure_list, [bacnet_address])
 
 
 WRITE_RELEASE_SERVICE_NAME = "write_release"
 ATTR_PRIORITY = "priority"
-WRITE_RELEASE_SCHEMA = vol.Schema(
-    {
-        vol.Required(ATTR_ENTITY_ID): entity_ids_validator,
-        vol.Optional(ATTR_PRIORITY): int,
-    }
+ATTR_WAIT_FOR_CONFIRMATION = "wait_for_confirmation"
+WRITE_RELEASE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_ENTITY_ID): entity_ids_validator,
+            vol.Optional(ATTR_ADDRESS): BACNET_ADDRESSES,
+            vol.Optional(ATTR_PRIORITY): int,
+            vol.Optional(ATTR_WAIT_FOR_CONFIRMATION): cv.positive_time_period,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_ADDRESS),
 )
 
 WRITE_PROPERTY_SERVICE_NAME = "write_property"
 ATTR_PROPERTY = "property"
 ATTR_VALUE = "value"
 ATTR_INDEX = "array_index"
-WRITE_PROPERTY_SCHEMA = vol.Schema(
+WRITE_PROPERTY_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_ENTITY_ID): entity_ids_validator,
+            vol.Optional(ATTR_ADDRESS): BACNET_ADDRESSES,
+            vol.Optional(ATTR_PROPERTY): str,
+            vol.Optional(ATTR_VALUE): str,
+            vol.Optional(ATTR_INDEX): int,
+            vol.Optional(ATTR_PRIORITY): int,
+            vol.Optional(ATTR_WAIT_FOR_CONFIRMATION): cv.positive_time_period,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_ADDRESS),
+)
+
+READ_PROPERTIES_SERVICE_NAME = "read_properties"
+ATTR_OBJECTS = "objects"
+ATTR_DEVICE = "device"
+ATTR_OBJECT = "object"
+ATTR_MAX_AGE = "max_age"
+READ_PROPERTIES_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_OBJECTS): [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_DEVICE): str,
+                        vol.Required(ATTR_OBJECT): str,
+                        vol.Optional(ATTR_PROPERTY, default="presentValue"): str,
+                    }
+                )
+            ],
+            vol.Optional(ATTR_ADDRESS): BACNET_ADDRESSES,
+            vol.Optional(ATTR_PROPERTY, default="presentValue"): str,
+            vol.Optional(ATTR_MAX_AGE): cv.time_period,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_OBJECTS, ATTR_ADDRESS),
+)
+
+READ_PROPERTY_SERVICE_NAME = "read_property"
+READ_PROPERTY_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_ADDRESS): BACNET_ADDRESSES,
+            vol.Inclusive(ATTR_DEVICE, "address"): str,
+            vol.Inclusive(ATTR_OBJECT, "address"): str,
+            vol.Required(ATTR_PROPERTY): str,
+            vol.Optional(ATTR_INDEX): int,
+            vol.Optional(ATTR_MAX_AGE): cv.time_period,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_ADDRESS, ATTR_DEVICE),
+)
+
+IMPORT_TREND_LOG_SERVICE_NAME = "import_trend_log"
+ATTR_PAGE_SIZE = "page_size"
+IMPORT_TREND_LOG_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Optional(ATTR_DEVICE): str,
+        vol.Required(ATTR_OBJECT): str,
+        vol.Optional(ATTR_PAGE_SIZE, default=168): vol.All(
+            int, vol.Range(min=1, max=8760)
+        ),
+    }
+)
+
+SET_STATISTICS_MODE_SERVICE_NAME = "set_statistics_mode"
+ATTR_STATISTICS_ONLY = "statistics_only"
+ATTR_STATE_INTERVAL = "state_interval"
+SET_STATISTICS_MODE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_STATISTICS_ONLY): cv.boolean,
+        vol.Optional(ATTR_STATE_INTERVAL): cv.time_period,
+    }
+)
+
+READ_PRIORITY_ARRAY_SERVICE_NAME = "read_priority_array"
+READ_PRIORITY_ARRAY_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_ADDRESS): BACNET_ADDRESSES,
+            vol.Optional(ATTR_MAX_AGE): cv.time_period,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_ADDRESS),
+)
+
+ATTR_PRIORITY_ARRAY = "priority_array"
+ATTR_ACTIVE_PRIORITY = "active_priority"
+
+OVERRIDE_REPORT_SERVICE_NAME = "override_report"
+ATTR_MIN_PRIORITY = "min_priority"
+OVERRIDE_REPORT_SCHEMA = vol.Schema(
     {
-        vol.Required(ATTR_ENTITY_ID): entity_ids_validator,
-        vol.Optional(ATTR_PROPERTY): str,
-        vol.Optional(ATTR_VALUE): str,
-        vol.Optional(ATTR_INDEX): int,
-        vol.Optional(ATTR_PRIORITY): int,
+        vol.Required(ATTR_DEVICE): str,
+        vol.Optional(ATTR_MIN_PRIORITY, default=16): vol.All(
+            int, vol.Range(min=1, max=16)
+        ),
     }
 )
 
+# Object types with a priorityArray, that can be overridden by writes.
+COMMANDABLE_OBJECT_TYPES = {
+    "analogOutput",
+    "analogValue",
+    "binaryOutput",
+    "binaryValue",
+    "multiStateOutput",
+    "multiStateValue",
+}
+
+SNAPSHOT_SETPOINTS_SERVICE_NAME = "snapshot_setpoints"
+RESTORE_SETPOINTS_SERVICE_NAME = "restore_setpoints"
+ATTR_NAME = "name"
+ATTR_DEVICES = "devices"
+ATTR_OBJECT_TYPES = "object_types"
+ATTR_AREA_ID = "area_id"
+ATTR_REMOVE = "remove"
+SNAPSHOT_SETPOINTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Optional(ATTR_DEVICES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_OBJECT_TYPES): vol.All(
+            cv.ensure_list, [vol.In(COMMANDABLE_OBJECT_TYPES)]
+        ),
+        vol.Optional(ATTR_AREA_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+RESTORE_SETPOINTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Optional(ATTR_REMOVE, default=False): cv.boolean,
+    }
+)
+
+# A profiling session stops by itself after its duration, in seconds. Its
+# response lists the PROFILE_TOP_FUNCTIONS functions with the most
+# cumulative time.
+PROFILE_START_SERVICE_NAME = "profile_start"
+PROFILE_STOP_SERVICE_NAME = "profile_stop"
+ATTR_DURATION = "duration"
+PROFILE_DEFAULT_DURATION = 60
+PROFILE_MAX_DURATION = 600
+PROFILE_TOP_FUNCTIONS = 20
+PROFILE_START_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=PROFILE_DEFAULT_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_DURATION)
+        ),
+    }
+)
+PROFILE_STOP_SCHEMA = vol.Schema({})
+
+# Memory snapshots trace this many frames per allocation, so allocations in
+# the standard library are attributed to the line of the integration or
+# aioecopanel that caused them.
+MEMORY_SNAPSHOT_SERVICE_NAME = "memory_snapshot"
+ATTR_TOP = "top"
+ATTR_STOP_TRACING = "stop_tracing"
+MEMORY_TRACE_FRAMES = 8
+MEMORY_SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_TOP, default=20): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+        vol.Optional(ATTR_STOP_TRACING, default=False): cv.boolean,
+    }
+)
+
+CONF_WRITE_CONFIRMATION = "write_confirmation"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_LOOP_WATCHDOG = "loop_watchdog"
 CONF_ANALOG_OUTPUT = "analog_output"
 CONF_ANALOG_VALUE = "analog_value"
 CONF_BINARY_OUTPUT = "binary_output"
 CONF_BINARY_VALUE = "binary_value"
 CONF_MULTISTATE_OUTPUT = "multistate_output"
 CONF_MULTISTATE_VALUE = "multistate_value"
+
+API_JSON_URI = "/apiv1/json"
+API_DEVICE_URI = "/apiv1/{deviceid}"
+API_OBJECT_URI = "/apiv1/{deviceid}/{objectid}"
+API_PROPERTY_URI = "/apiv2/{deviceid}/{objectid}/{propertyid}"
+
+# The add-on is reached through a connection pool of its own, so polling and
+# write bursts do not compete with other integrations for connections. It
+# holds up to HTTP_POOL_LIMIT connections, the websocket included, and keeps
+# idle ones open for HTTP_KEEPALIVE_TIMEOUT seconds. The add-on is local, so
+# connecting and answering should not take long.
+HTTP_POOL_LIMIT = 24
+HTTP_KEEPALIVE_TIMEOUT = 30
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_REQUEST_TIMEOUT = 15
+
+# Properties read through the add-on are cached for this many seconds,
+# unless the property has its own TTL, and up to this many bytes.
+PROPERTY_CACHE_TTL = 30
+PROPERTY_CACHE_TTLS = {
+    # Invalidated by every COV or write of the object, so kept for long.
+    "priorityArray": 600,
+    "reliability": 30,
+    "relinquishDefault": 300,
+    "objectName": 3600,
+    "description": 3600,
+    "stateText": 3600,
+}
+PROPERTY_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# Writes are tracked this many seconds for a confirming COV, unless the
+# caller waits for the confirmation with its own timeout.
+WRITE_CONFIRMATION_TIMEOUT = 30
+
+# presentValue writes go over the open websocket when possible, and through the
+# REST API when the websocket is down or sending fails.
+WRITE_PATH_REST = "rest"
+WRITE_PATH_WEBSOCKET = "websocket"
+
+# Writes from entities go ahead of bulk writes from services. Every device
+# has at most WRITE_DEVICE_CONCURRENCY writes in flight, all devices together
+# at most WRITE_RATE writes per second with bursts of WRITE_BURST.
+LANE_INTERACTIVE = "interactive"
+LANE_BULK = "bulk"
+WRITE_DEVICE_CONCURRENCY = 2
+WRITE_RATE = 20
+WRITE_BURST = 40
+WRITE_QUEUE_SIZES = {LANE_INTERACTIVE: 100, LANE_BULK: 2000}
+
+# Websocket messages are merged for this many milliseconds and then handled in
+# a single fan-out, unless configured otherwise. Objects in alarm and objects
+# of these types skip the window, as do objects with a write waiting for them.
+DEFAULT_COALESCE_WINDOW = 100
+ALARM_OBJECT_TYPES = {"eventEnrollment", "alertEnrollment"}
+
+# Platforms are only set up for the object types a site has, and set up later
+# when objects of a new type show up.
+PLATFORM_OBJECT_TYPES = {
+    "binary_sensor": {"binaryInput"},
+    "sensor": {"analogInput", "multiStateInput"},
+    "number": {"analogOutput", "analogValue"},
+    "switch": {"binaryOutput", "binaryValue"},
+    "select": {"multiStateOutput", "multiStateValue"},
+}
+
+# When enabled, the watchdog warns about sections of the integration that held
+# the event loop for more than LOOP_WATCHDOG_THRESHOLD seconds, at most once
+# every LOOP_WATCHDOG_WARN_INTERVAL seconds.
+LOOP_WATCHDOG_THRESHOLD = 0.1
+LOOP_WATCHDOG_WARN_INTERVAL = 300
+
+# Entities are created and added in chunks of this many, yielding to the event
+# loop in between, so very large sites do not block it during setup.
+ENTITY_CHUNK_SIZE = 250
+
+# Maximum number of objects refreshed through the add-on API at the same time.
+REFRESH_CONCURRENCY = 8
+
+# Maximum number of setpoints a restore writes at the same time.
+RESTORE_CONCURRENCY = 8
+
+# Payloads of at least this many bytes are decoded in the executor.
+JSON_EXECUTOR_THRESHOLD = 64 * 1024
@@ -2,21 +2,159 @@
 
 from __future__ import annotations
 
+import asyncio
+import socket
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime
+from functools import partial
+from time import monotonic
+from typing import Any
 
+from aiohttp import (
+    ClientError,
+    ClientSession,
+    ClientTimeout,
+    WSMsgType,
+)
+from aiohttp.hdrs import USER_AGENT
 from aioecopanel import (
+    Device,
     DeviceDict,
     DeviceDictError,
     EcoPanelConnectionClosed,
+    EcoPanelConnectionError,
+    EcoPanelConnectionTimeoutError,
+    EcoPanelEmptyResponseError,
     EcoPanelError,
     Interface,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import (
+    ENABLE_CLEANUP_CLOSED,
+    SERVER_SOFTWARE,
+    HassClientResponse,
+    HomeAssistantTCPConnector,
+)
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util.json import json_loads
+from yarl import URL
+
+from .addresses import EntityAddressIndex
+from .cache import PropertyCache
+from .const import (
+    API_DEVICE_URI,
+    API_JSON_URI,
+    API_OBJECT_URI,
+    API_PROPERTY_URI,
+    ALARM_OBJECT_TYPES,
+    COMMANDABLE_OBJECT_TYPES,
+    CONF_COALESCE_WINDOW,
+    CONF_LOOP_WATCHDOG,
+    DEFAULT_COALESCE_WINDOW,
+    DEVICE_UNAVAILABLE_RELIABILITY,
+    DEVICE_UNAVAILABLE_SYSTEM_STATUS,
+    DOMAIN,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_REQUEST_TIMEOUT,
+    JSON_EXECUTOR_THRESHOLD,
+    LANE_INTERACTIVE,
+    LOGGER,
+    PLATFORM_OBJECT_TYPES,
+    PROPERTY_CACHE_MAX_BYTES,
+    PROPERTY_CACHE_TTL,
+    PROPERTY_CACHE_TTLS,
+    REFRESH_CONCURRENCY,
+    SCAN_INTERVAL,
+    WEBSOCKET_GRACE_PERIOD,
+    WRITE_BURST,
+    WRITE_CONFIRMATION_TIMEOUT,
+    WRITE_DEVICE_CONCURRENCY,
+    WRITE_QUEUE_SIZES,
+    WRITE_PATH_REST,
+    WRITE_PATH_WEBSOCKET,
+    WRITE_RATE,
+)
+from .helper import active_priority, priority_array_slots
+from .memory import MemorySnapshots, deep_sizes
+from .metrics import LatencyHistogram, PoolStats, SetupStats
+from .models import (
+    STATUS_IN_ALARM,
+    ObjectRecord,
+    WriteConfirmation,
+    compact_object,
+    pack_status_flags,
+    values_match,
+)
+from .profiler import MessageProfiler
+from .scheduler import WriteScheduler
+from .staleness import StaleObjectTracker
+from .statistics import LiveStatistics
+from .watchdog import LoopWatchdog
+
+
+class WriteNotConfirmedError(HomeAssistantError):
+    """Raised when a device did not confirm a write in time."""
+
+
+def _build_devices(data: dict[str, Any]) -> dict[str, Device]:
+    """Build the devices contained in decoded device data."""
+    devices = {
+        deviceid: Device.update_device(deviceid, device_data)
+        for deviceid, device_data in data.items()
+        if deviceid and isinstance(device_data, dict)
+    }
+
+    for device in devices.values():
+        for obj in device.objects.values():
+            compact_object(obj)
+
+    return devices
+
+
+def _decode_devices(payload: bytes | str) -> tuple[Any, dict[str, Device]]:
+    """Decode a JSON payload of device data and build its devices.
+
+    Safe to run in the executor, as it does not touch any shared state.
+    """
+    data = json_loads(payload)
+
+    if not isinstance(data, dict):
+        return data, {}
+
+    return data, _build_devices(data)
+
+
+def _create_session(pool: PoolStats) -> ClientSession:
+    """Create the HTTP session for the add-on, with a connection pool of its own.
 
-from .const import DOMAIN, LOGGER, SCAN_INTERVAL
+    Home Assistant's session helpers always use the shared connector, so the
+    session is set up the way they do it, on a connector of its own. There is
+    no total timeout on the session, as the websocket stays open on it.
+    Requests are limited by the timeout of the interface instead.
+    """
+    connector = HomeAssistantTCPConnector(
+        enable_cleanup_closed=ENABLE_CLEANUP_CLOSED,
+        limit=pool.limit,
+        limit_per_host=pool.limit,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+
+    return ClientSession(
+        connector=connector,
+        timeout=ClientTimeout(total=None, sock_connect=HTTP_CONNECT_TIMEOUT),
+        headers={USER_AGENT: SERVER_SOFTWARE},
+        json_serialize=json_dumps,
+        response_class=HassClientResponse,
+        trace_configs=[pool.trace_config()],
+    )
 
 
 class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
@@ -32,32 +170,1085 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
     ) -> None:
         """Initialize EcoPanel data updater"""
 
+        # Requests through the connection pool, and how long they took.
+        self.http_pool = PoolStats(HTTP_POOL_LIMIT)
         self.interface = Interface(
             host=entry.data[CONF_HOST],
             port=entry.data[CONF_PORT],
-            session=async_get_clientsession(hass),
+            timeout=HTTP_REQUEST_TIMEOUT,
+            session=_create_session(self.http_pool),
         )
         self.unsub: CALLBACK_TYPE | None = None
+        # Devices whose entities are unavailable, with the reason why:
+        # "status" when the device reports itself as not operational,
+        # "stale" when it went silent while the websocket was down and
+        # "refresh" when refreshing it through the API failed.
+        self.unavailable_devices: dict[str, str] = {}
+        self.records: dict[str, dict[str, ObjectRecord]] = {}
+        # The object types seen so far, and the platforms set up for them.
+        self.object_types: set[str] = set()
+        self.platforms: set[str] = set()
+        self._platforms_set_up = False
+        self._device_last_seen: dict[str, float] = {}
+        # The name, manufacturer and model each device was registered with.
+        self._device_identities: dict[str, tuple[Any, Any, Any]] = {}
+        self.device_registry_updates = 0
+        self._unsub_stale_check: CALLBACK_TYPE | None = None
+        self._websocket_lost_at: float | None = None
+        self.property_cache = PropertyCache(
+            hass,
+            entry,
+            PROPERTY_CACHE_TTL,
+            PROPERTY_CACHE_MAX_BYTES,
+            PROPERTY_CACHE_TTLS,
+        )
+        self.statistics = LiveStatistics(hass)
+        self.setup_stats = SetupStats()
+        self.watchdog = LoopWatchdog(entry.data.get(CONF_LOOP_WATCHDOG, False))
+        self.profiler = MessageProfiler(hass)
+        self.memory = MemorySnapshots(hass, self)
+        self.addresses = EntityAddressIndex(hass, self)
+        self.stale_objects = StaleObjectTracker(hass, self)
+
+        # Writes waiting for a COV of their object, and how long that took.
+        self._confirmations: dict[tuple[str, str], list[WriteConfirmation]] = {}
+        self.write_latency: dict[str, LatencyHistogram] = {}
+        self.write_path_latency = {
+            WRITE_PATH_REST: LatencyHistogram(),
+            WRITE_PATH_WEBSOCKET: LatencyHistogram(),
+        }
+        self.websocket_write_fallbacks = 0
+        self.write_scheduler = WriteScheduler(
+            hass.loop,
+            WRITE_DEVICE_CONCURRENCY,
+            WRITE_RATE,
+            WRITE_BURST,
+            WRITE_QUEUE_SIZES,
+        )
+
+        # Websocket messages merged during the coalescing window, waiting to be
+        # handled in a single fan-out.
+        self.coalesce_window = (
+            entry.data.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW) / 1000
+        )
+        self._pending_messages: dict[str, dict[str, Any]] = {}
+        self._pending_devices: dict[str, Device] = {}
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self.websocket_messages = 0
+        self.websocket_immediate = 0
+        self.websocket_flushes = 0
+
+        # Entity listeners indexed by BACnet device and object, so a message
+        # for one device only wakes the entities of the objects it contains.
+        self._object_listeners: dict[str, dict[str, list[CALLBACK_TYPE]]] = {}
 
         super().__init__(
             hass,
             LOGGER,
             name=DOMAIN,
             update_interval=SCAN_INTERVAL,
+            # The websocket notifies the entities of the objects it updates, a
+            # refresh that returns the same data must not wake all of them.
+            always_update=False,
         )
 
     @callback
-    def _use_websocket(self) -> None:
-        """Use websockets for updating"""
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, scoped to a (deviceid, objectid) context."""
+        remove_listener = super().async_add_listener(update_callback, context)
+
+        if not isinstance(context, tuple):
+            return remove_listener
+
+        deviceid, objectid = context
+        listeners = self._object_listeners.setdefault(deviceid, {}).setdefault(
+            objectid, []
+        )
+        listeners.append(update_callback)
+        self.stale_objects.async_track(deviceid, objectid)
+
+        @callback
+        def remove_object_listener() -> None:
+            """Remove update listener from the coordinator and the object index."""
+            remove_listener()
+            listeners.remove(update_callback)
+            if not listeners:
+                objects = self._object_listeners[deviceid]
+                del objects[objectid]
+                if not objects:
+                    del self._object_listeners[deviceid]
+
+        return remove_object_listener
+
+    async def async_memory_estimates(self) -> dict[str, Any]:
+        """Estimate the bytes held by the BACnet state, caches and queues.
+
+        Only the entities and queued writes are collected on the event loop,
+        the structures are walked in the executor. Objects shared between
+        structures count for each of them.
+        """
+        with self.watchdog.section("memory_estimate"):
+            entities = {
+                update_callback.__self__
+                for objects in self._object_listeners.values()
+                for listeners in objects.values()
+                for update_callback in listeners
+                if hasattr(update_callback, "__self__")
+            }
+            structures = {
+                "coordinator_data": self.data.devices,
+                "records": self.records,
+                "state_options": [
+                    getattr(entity, "_state_options", None) for entity in entities
+                ],
+                "object_listeners": self._object_listeners,
+                "statistics": self.statistics.points,
+                "websocket_messages": (self._pending_messages, self._pending_devices),
+                "writes": list(self.write_scheduler.queued()),
+                "write_confirmations": self._confirmations,
+            }
+
+        sizes = await self.hass.async_add_executor_job(deep_sizes, structures)
+
+        return {
+            "coordinator_data": sizes["coordinator_data"],
+            "records": sizes["records"],
+            "entity_caches": {
+                "entities": len(entities),
+                "state_options": sizes["state_options"],
+                "object_listeners": sizes["object_listeners"],
+                "property_cache": self.property_cache.size,
+                "statistics": sizes["statistics"],
+            },
+            "pending": {
+                "websocket_messages": sizes["websocket_messages"],
+                "writes": sizes["writes"],
+                "write_confirmations": sizes["write_confirmations"],
+            },
+        }
+
+    def has_object_listeners(self, deviceid: str, objectid: str) -> bool:
+        """Return if any entity listens to a BACnet object."""
+        return objectid in self._object_listeners.get(deviceid, {})
+
+    @callback
+    def async_update_device_listeners(
+        self, deviceid: str, objectids: Iterable[str] | None = None
+    ) -> None:
+        """Update the listeners of one BACnet device, optionally only some objects."""
+        if not (objects := self._object_listeners.get(deviceid)):
+            return
+
+        for objectid in list(objects) if objectids is None else objectids:
+            for update_callback in list(objects.get(objectid, ())):
+                update_callback()
+
+    @callback
+    def _async_handle_message(
+        self,
+        message_data: dict[str, Any],
+        devices: dict[str, Device] | None = None,
+    ) -> None:
+        """Handle received device data, profiled while a session runs."""
+        if not self.profiler.running:
+            self._async_merge_message(message_data, devices)
+            return
+
+        with self.profiler.section():
+            self._async_merge_message(message_data, devices)
+
+    @callback
+    def _async_merge_message(
+        self,
+        message_data: dict[str, Any],
+        devices: dict[str, Device] | None = None,
+    ) -> None:
+        """Merge received device data and notify only the objects it contains."""
+        updated: dict[str, list[str]] = {}
+        availability_changed: set[str] = set()
+        timestamp = monotonic()
+
+        if devices is None:
+            devices = _build_devices(message_data)
+
+        with self.watchdog.section("merge"):
+            for deviceid, device in devices.items():
+                device_data: dict[str, Any] = message_data[deviceid]
+
+                if (current := self.data.devices.get(deviceid)) is None:
+                    self.data.devices[deviceid] = device
+                else:
+                    current.objects.update(device.objects)
+
+                self._update_records(deviceid, device)
+                self._device_last_seen[deviceid] = timestamp
+                updated[deviceid] = list(device.objects)
+
+                for objectid in device.objects:
+                    self.property_cache.invalidate_object(deviceid, objectid)
+
+                if self._confirmations:
+                    self._confirm_writes(deviceid, device_data)
+
+                was_available = deviceid not in self.unavailable_devices
+
+                if isinstance(device_object := device_data.get(deviceid), dict):
+                    reason = self._device_status_reason(device_object)
+                    self._async_register_device(deviceid)
+                elif self.unavailable_devices.get(deviceid) == "status":
+                    reason = "status"
+                else:
+                    reason = None
+
+                if reason is None:
+                    self.unavailable_devices.pop(deviceid, None)
+                else:
+                    self.unavailable_devices[deviceid] = reason
+
+                if was_available != (reason is None):
+                    availability_changed.add(deviceid)
+
+        with self.watchdog.section("fan_out"):
+            if not self.last_update_success:
+                self.last_update_success = True
+                self.async_update_listeners()
+                return
+
+            for deviceid, objectids in updated.items():
+                if deviceid in availability_changed:
+                    # Every entity of the device has to know about its availability.
+                    self.async_update_device_listeners(deviceid)
+                else:
+                    self.async_update_device_listeners(deviceid, objectids)
+
+    @callback
+    def async_register_devices(self) -> None:
+        """Register all BACnet devices in the device registry in a single pass."""
+        for deviceid in self.data.devices:
+            self._async_register_device(deviceid)
+
+    @callback
+    def _async_register_device(self, deviceid: str) -> None:
+        """Register a device, or update it when its name, vendor or model changed."""
+        device_object = self.data.devices[deviceid].objects.get(deviceid)
+        if device_object is None:
+            return
+
+        identity = (
+            device_object.objectName,
+            device_object.vendorName,
+            device_object.modelName,
+        )
+        if self._device_identities.get(deviceid) == identity:
+            return
+
+        self._device_identities[deviceid] = identity
+        self.device_registry_updates += 1
+
+        dr.async_get(self.hass).async_get_or_create(
+            config_entry_id=self.config_entry.entry_id,
+            identifiers={(DOMAIN, deviceid)},
+            name=f"{device_object.objectName}",
+            manufacturer=device_object.vendorName,
+            model=device_object.modelName,
+        )
+
+    @staticmethod
+    def _device_status_reason(device_object: dict[str, Any]) -> str | None:
+        """Return "status" if the device object reports it is not operational."""
+        if device_object.get("systemStatus") in DEVICE_UNAVAILABLE_SYSTEM_STATUS:
+            return "status"
+        if device_object.get("reliability") in DEVICE_UNAVAILABLE_RELIABILITY:
+            return "status"
+        return None
+
+    @callback
+    def _async_set_device_unavailable(self, deviceid: str, reason: str) -> None:
+        """Mark a device unavailable and notify its entities if it was available."""
+        was_available = deviceid not in self.unavailable_devices
+        self.unavailable_devices[deviceid] = reason
+
+        if was_available:
+            self.async_update_device_listeners(deviceid)
+
+    @callback
+    def _async_websocket_lost(self) -> None:
+        """Start checking for devices going stale while the websocket is down.
+
+        Nothing is marked unavailable within the grace period, so a short
+        blip of the websocket does not flap every entity on the site.
+        """
+        if self._websocket_lost_at is None:
+            self._websocket_lost_at = monotonic()
+
+        if self._unsub_stale_check is None:
+            self._unsub_stale_check = async_call_later(
+                self.hass, WEBSOCKET_GRACE_PERIOD, self._async_check_stale_devices
+            )
+
+    @callback
+    def _async_websocket_restored(self) -> None:
+        """Stop checking for stale devices and fetch what was missed meanwhile."""
+        if self._unsub_stale_check is not None:
+            self._unsub_stale_check()
+            self._unsub_stale_check = None
+
+        if self._websocket_lost_at is None:
+            # The first connection, the data was just fetched.
+            return
+
+        self._websocket_lost_at = None
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_refresh_all_devices(), "bacnet-refresh-all-devices"
+        )
+
+    async def _async_refresh_all_devices(self) -> None:
+        """Fetch the data of all devices, as COVs may have been lost meanwhile.
+
+        Devices that are missing from the full update, or all of them when it
+        fails, are refreshed one by one.
+        """
+        data: Any = None
+        devices: dict[str, Device] = {}
+
+        try:
+            if payload := await self._async_fetch(API_JSON_URI):
+                data, devices = await self._async_decode_devices(payload)
+        except (EcoPanelError, ValueError) as err:
+            LOGGER.warning(f"Failed to fetch all devices after reconnecting: {err}")
+        else:
+            if devices:
+                # Pending messages are older than the full update.
+                self._async_flush_messages()
+                self._async_handle_message(data, devices)
+
+        semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+        async def refresh(deviceid: str) -> None:
+            async with semaphore:
+                await self.async_refresh_device(deviceid)
+
+        await asyncio.gather(
+            *(
+                refresh(deviceid)
+                for deviceid in list(self.data.devices)
+                if deviceid not in devices
+            )
+        )
+
+    @callback
+    def _async_check_stale_devices(self, _now: datetime) -> None:
+        """Mark devices unavailable that had no data during the grace period.
+
+        Every device gets the grace period from the moment the websocket was
+        lost, or from its last data when that was refreshed since, and the
+        check runs again at the next deadline.
+        """
+        self._unsub_stale_check = None
+
+        if self.interface.connected or self._websocket_lost_at is None:
+            return
+
+        grace_period = WEBSOCKET_GRACE_PERIOD.total_seconds()
+        now = monotonic()
+        next_deadline: float | None = None
+
+        for deviceid in list(self.data.devices):
+            if deviceid in self.unavailable_devices:
+                continue
+
+            deadline = (
+                max(self._device_last_seen.get(deviceid, 0), self._websocket_lost_at)
+                + grace_period
+            )
+            if deadline <= now:
+                self._async_set_device_unavailable(deviceid, "stale")
+            elif next_deadline is None or deadline < next_deadline:
+                next_deadline = deadline
+
+        # Keep checking until the websocket is back.
+        self._unsub_stale_check = async_call_later(
+            self.hass,
+            grace_period if next_deadline is None else next_deadline - now,
+            self._async_check_stale_devices,
+        )
+
+    def _update_records(self, deviceid: str, device: Device) -> None:
+        """Update the per-object records of a device from received objects."""
+        timestamp = monotonic()
+        records = self.records.setdefault(deviceid, {})
+
+        for objectid, obj in device.objects.items():
+            if (record := records.get(objectid)) is None:
+                records[objectid] = record = ObjectRecord.from_object(
+                    objectid, obj, timestamp
+                )
+                if record.object_type not in self.object_types:
+                    self._async_object_type_added(record.object_type)
+            else:
+                record.update(obj, timestamp)
+
+    @callback
+    def _async_object_type_added(self, object_type: str) -> None:
+        """Set up the platform of a new object type, once setup is done."""
+        self.object_types.add(object_type)
+
+        if self._platforms_set_up:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self.async_setup_platforms(),
+                f"bacnet-setup-platforms-{object_type}",
+            )
+
+    async def async_setup_platforms(self) -> None:
+        """Set up the platforms for the object types seen so far, if not set up yet."""
+        self._platforms_set_up = True
+
+        platforms = [
+            platform
+            for platform, object_types in PLATFORM_OBJECT_TYPES.items()
+            if platform not in self.platforms
+            and not object_types.isdisjoint(self.object_types)
+        ]
+        if not platforms:
+            return
+
+        LOGGER.debug("Setting up platforms %s", platforms)
+        self.platforms.update(platforms)
+
+        await self.hass.config_entries.async_forward_entry_setups(
+            self.config_entry, platforms
+        )
+
+    async def _async_fetch(
+        self, uri: str, params: dict[str, Any] | None = None
+    ) -> bytes:
+        """GET the raw body of an add-on API endpoint."""
+        url = URL.build(
+            scheme="http", host=self.interface.host, port=self.interface.port, path=uri
+        )
+
+        try:
+            async with asyncio.timeout(self.interface.timeout):
+                async with self.interface.session.get(  # pyright: ignore[reportOptionalMemberAccess]
+                    url, params=params, headers={"Accept": "application/json"}
+                ) as response:
+                    payload = await response.read()
+        except TimeoutError as err:
+            raise EcoPanelConnectionTimeoutError(
+                f"Timeout occurred while connecting to the add-on API at {uri}."
+            ) from err
+        except (ClientError, socket.gaierror) as err:
+            raise EcoPanelConnectionError(
+                f"Error occurred while communicating with the add-on API at {uri}."
+            ) from err
+
+        if response.status // 100 in [4, 5]:
+            raise EcoPanelError(response.status, payload.decode(errors="replace"))
+
+        return payload
+
+    async def _async_decode_devices(
+        self, payload: bytes | str
+    ) -> tuple[Any, dict[str, Device]]:
+        """Decode device data, in the executor when the payload is large.
+
+        Decoding and building several megabytes of device data takes long
+        enough to stall the event loop, small messages are cheaper inline.
+        """
+        if len(payload) < JSON_EXECUTOR_THRESHOLD:
+            with self.watchdog.section("decode"), self.profiler.section():
+                return _decode_devices(payload)
+
+        LOGGER.debug(f"Decoding {len(payload)} bytes of device data in executor")
+        return await self.hass.async_add_executor_job(_decode_devices, payload)
+
+    async def async_request(
+        self, uri: str, params: dict[str, Any] | None = None
+    ) -> Any:
+        """GET and decode a JSON document from the add-on API."""
+        payload = await self._async_fetch(uri, params)
+
+        if not payload:
+            return None
+
+        try:
+            if len(payload) < JSON_EXECUTOR_THRESHOLD:
+                return json_loads(payload)
+            return await self.hass.async_add_executor_job(json_loads, payload)
+        except ValueError as err:
+            raise EcoPanelError(f"Invalid JSON received from {uri}: {err}") from err
+
+    async def async_refresh_device(self, deviceid: str) -> None:
+        """Refresh the data of a single BACnet device through the add-on API."""
+        try:
+            device_data = await self.async_request(
+                API_DEVICE_URI.format(deviceid=deviceid)
+            )
+        except EcoPanelError as err:
+            LOGGER.warning(f"Failed to refresh {deviceid}: {err}")
+            if deviceid not in self.unavailable_devices:
+                self._async_set_device_unavailable(deviceid, "refresh")
+            return
+
+        if not isinstance(device_data, dict) or not device_data:
+            LOGGER.warning(f"Received no data for {deviceid}: {device_data}")
+            return
+
+        self._async_handle_message({deviceid: device_data})
+
+    async def async_refresh_object(self, deviceid: str, objectid: str) -> None:
+        """Refresh the data of a single BACnet object through the add-on API."""
+        object_data = await self.async_request(
+            API_OBJECT_URI.format(deviceid=deviceid, objectid=objectid)
+        )
 
-        def check_data(data: DeviceDict) -> None:
-            LOGGER.debug("check_data")
-            if not isinstance(data, DeviceDict):  # pyright: ignore[reportUnnecessaryIsInstance]
-                LOGGER.warning(f"Received data is not DeviceDict type! {data}")
-            elif data.devices is None:  # pyright: ignore[reportUnnecessaryComparison]
-                LOGGER.warning("Received data.devices is NoneType!")
+        if not isinstance(object_data, dict) or not object_data:
+            raise EcoPanelEmptyResponseError(
+                f"Received no data for {deviceid} {objectid}: {object_data}"
+            )
+
+        self._async_handle_message({deviceid: {objectid: object_data}})
+
+    async def async_refresh_objects(self, objects: Iterable[tuple[str, str]]) -> None:
+        """Refresh many BACnet objects with a bounded number of requests at once."""
+        semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+        async def refresh(deviceid: str, objectid: str) -> None:
+            async with semaphore:
+                try:
+                    await self.async_refresh_object(deviceid, objectid)
+                except EcoPanelError as err:
+                    LOGGER.warning(f"Failed to refresh {deviceid} {objectid}: {err}")
+
+        await asyncio.gather(
+            *(refresh(deviceid, objectid) for deviceid, objectid in set(objects))
+        )
+
+    async def async_read_property(
+        self,
+        deviceid: str,
+        objectid: str,
+        propertyid: str,
+        array_index: int | None = None,
+        max_age: float | None = None,
+    ) -> Any:
+        """Read any property of an object, answered from cache when possible."""
+        return await self.property_cache.async_get(
+            (deviceid, objectid, propertyid, array_index),
+            partial(
+                self._async_fetch_property, deviceid, objectid, propertyid, array_index
+            ),
+            max_age,
+        )
+
+    def cached_priority_array(self, deviceid: str, objectid: str) -> list[Any] | None:
+        """Return the priorityArray of an object if it was read and is still valid."""
+        if (
+            priority_array := self.property_cache.peek(
+                (deviceid, objectid, "priorityArray", None)
+            )
+        ) is None:
+            return None
+
+        return priority_array_slots(priority_array)
+
+    async def async_read_priority_array(
+        self, deviceid: str, objectid: str, max_age: float | None = None
+    ) -> list[Any]:
+        """Read the priorityArray of an object and show it on its entity."""
+        slots = priority_array_slots(
+            await self.async_read_property(
+                deviceid, objectid, "priorityArray", max_age=max_age
+            )
+        )
+        self.async_update_device_listeners(deviceid, [objectid])
+
+        return slots
+
+    async def async_override_report(
+        self, deviceid: str, min_priority: int = 16
+    ) -> dict[str, Any]:
+        """Report which commandable objects of a device are written at which priority.
+
+        The priorityArrays are read by a few workers at a time, so a device
+        with many objects does not flood the add-on.
+        """
+        device = self.data.devices[deviceid]
+        objectids = iter(
+            [
+                objectid
+                for objectid, obj in device.objects.items()
+                if obj.objectIdentifier
+                and obj.objectIdentifier[0] in COMMANDABLE_OBJECT_TYPES
+            ]
+        )
+        overrides: list[dict[str, Any]] = []
+        errors: list[dict[str, str]] = []
+
+        async def worker() -> None:
+            for objectid in objectids:
+                try:
+                    slots = priority_array_slots(
+                        await self.async_read_property(
+                            deviceid, objectid, "priorityArray"
+                        )
+                    )
+                except EcoPanelError as err:
+                    errors.append({"object": objectid, "error": str(err)})
+                    continue
+
+                if (priority := active_priority(slots)) is None or priority > min_priority:
+                    continue
+
+                overrides.append(
+                    {
+                        "object": objectid,
+                        "name": device.objects[objectid].objectName,
+                        "priority": priority,
+                        "value": slots[priority - 1],
+                        "slots": {
+                            index: slot
+                            for index, slot in enumerate(slots, start=1)
+                            if slot is not None
+                        },
+                    }
+                )
+
+        await asyncio.gather(*(worker() for _ in range(REFRESH_CONCURRENCY)))
+
+        overrides.sort(key=lambda override: (override["priority"], override["object"]))
+
+        return {"device": deviceid, "overrides": overrides, "errors": errors}
+
+    async def _async_fetch_property(
+        self,
+        deviceid: str,
+        objectid: str,
+        propertyid: str,
+        array_index: int | None,
+    ) -> Any:
+        """Read a property of an object through the add-on API."""
+        result = await self.async_request(
+            API_PROPERTY_URI.format(
+                deviceid=deviceid, objectid=objectid, propertyid=propertyid
+            ),
+            params={"array_index": array_index} if array_index is not None else None,
+        )
+
+        if isinstance(result, dict) and propertyid in result:
+            return result[propertyid]
+
+        return result
+
+    def _track_write(
+        self,
+        deviceid: str,
+        objectid: str,
+        propertyid: str,
+        value: Any,
+        array_index: int | None,
+        timeout: float | None,
+    ) -> WriteConfirmation:
+        """Start waiting for the COV that confirms a write."""
+        confirmation = WriteConfirmation(
+            deviceid,
+            objectid,
+            propertyid,
+            value,
+            monotonic(),
+            self.hass.loop.create_future(),
+            array_index=array_index,
+        )
+        key = (deviceid, objectid)
+        self._confirmations.setdefault(key, []).append(confirmation)
+        confirmation.timer = self.hass.loop.call_later(
+            timeout or WRITE_CONFIRMATION_TIMEOUT,
+            self._expire_confirmation,
+            key,
+            confirmation,
+        )
+
+        return confirmation
+
+    def _untrack_write(
+        self, key: tuple[str, str], confirmation: WriteConfirmation
+    ) -> None:
+        """Stop waiting for the confirmation of a write."""
+        if confirmation.timer is not None:
+            confirmation.timer.cancel()
+
+        if (pending := self._confirmations.get(key)) is not None:
+            if confirmation in pending:
+                pending.remove(confirmation)
+            if not pending:
+                del self._confirmations[key]
+
+    @callback
+    def _expire_confirmation(
+        self, key: tuple[str, str], confirmation: WriteConfirmation
+    ) -> None:
+        """Give up on a write that was not confirmed in time."""
+        self._untrack_write(key, confirmation)
+        self.write_latency.setdefault(key[0], LatencyHistogram()).timeouts += 1
+        self.write_path_latency[confirmation.path].timeouts += 1
+
+        if not confirmation.future.done():
+            confirmation.future.set_result(None)
+
+    @callback
+    def _confirm_writes(self, deviceid: str, device_data: dict[str, Any]) -> None:
+        """Confirm the writes that a message of a device shows were taken."""
+        now = monotonic()
+
+        for objectid, properties in device_data.items():
+            key = (deviceid, objectid)
+            if key not in self._confirmations or not isinstance(properties, dict):
+                continue
+
+            for confirmation in list(self._confirmations[key]):
+                if not confirmation.matches(properties):
+                    continue
+
+                latency = now - confirmation.started
+                self._untrack_write(key, confirmation)
+                self.write_latency.setdefault(deviceid, LatencyHistogram()).observe(
+                    latency
+                )
+                self.write_path_latency[confirmation.path].observe(latency)
+                if not confirmation.future.done():
+                    confirmation.future.set_result(latency)
+
+    async def _async_write(
+        self,
+        deviceid: str,
+        objectid: str,
+        propertyid: str,
+        value: Any,
+        array_index: int | None,
+        write: Callable[[], Awaitable[Any]],
+        wait_for_confirmation: float | None,
+        lane: str,
+        over_websocket: bool = False,
+    ) -> float | None:
+        """Write to an object once the scheduler allows, tracking when a COV confirms it.
+
+        Returns the latency until the confirmation if it was waited for.
+        """
+
+        async def tracked_write() -> WriteConfirmation:
+            """Send the write, waiting for its confirmation from now on."""
+            self.property_cache.invalidate_object(deviceid, objectid)
+            confirmation = self._track_write(
+                deviceid, objectid, propertyid, value, array_index, wait_for_confirmation
+            )
+
+            try:
+                if not over_websocket or not await self._async_websocket_write(
+                    confirmation
+                ):
+                    confirmation.path = WRITE_PATH_REST
+                    # The latency of the REST path starts with its own request.
+                    confirmation.started = monotonic()
+                    await write()
+            except BaseException:
+                self._untrack_write((deviceid, objectid), confirmation)
+                raise
+
+            return confirmation
+
+        confirmation = await self.write_scheduler.async_run(
+            deviceid, lane, tracked_write
+        )
+
+        if (
+            value is not None
+            and propertyid == "presentValue"
+            and array_index is None
+            and (device := self.data.devices.get(deviceid)) is not None
+            and (obj := device.objects.get(objectid)) is not None
+            and confirmation.matches({"presentValue": obj.presentValue})
+        ):
+            # The object already had this value, no COV is going to follow.
+            self._confirm_writes(deviceid, {objectid: {"presentValue": obj.presentValue}})
+
+        if wait_for_confirmation is None:
+            return None
+
+        if (latency := await confirmation.future) is None:
+            latency = await self._async_read_back(confirmation)
+
+        if latency is None:
+            raise WriteNotConfirmedError(
+                translation_domain=DOMAIN,
+                translation_key="write_not_confirmed",
+                translation_placeholders={
+                    "device": deviceid,
+                    "object": objectid,
+                    "timeout": f"{wait_for_confirmation:g}",
+                },
+            )
+
+        return latency
+
+    async def _async_read_back(self, confirmation: WriteConfirmation) -> float | None:
+        """Read a written property back when no COV showed it in time.
+
+        COVs mostly carry presentValue and statusFlags, so writes to other
+        properties are usually confirmed this way. Returns the latency since
+        the write if the device has the written value.
+        """
+        if confirmation.value is None:
+            return None
+
+        try:
+            value = await self.async_read_property(
+                confirmation.deviceid,
+                confirmation.objectid,
+                confirmation.propertyid,
+                confirmation.array_index,
+                max_age=0,
+            )
+        except EcoPanelError as err:
+            LOGGER.debug(
+                f"Reading back {confirmation.propertyid} of {confirmation.deviceid}/"
+                f"{confirmation.objectid} failed: {err}"
+            )
+            return None
+
+        if not values_match(confirmation.value, value):
+            return None
+
+        return monotonic() - confirmation.started
+
+    async def _async_websocket_write(self, confirmation: WriteConfirmation) -> bool:
+        """Write a presentValue over the open websocket.
+
+        The add-on does not acknowledge websocket writes, the COV that follows
+        confirms them like any other write. Returns False if the write could
+        not be sent, and has to go through the REST API instead.
+        """
+        client = self.interface._client  # pyright: ignore[reportPrivateUsage]
+        if client is None or client.closed:
+            return False
+
+        deviceid, objectid = confirmation.deviceid, confirmation.objectid
+        confirmation.path = WRITE_PATH_WEBSOCKET
+
+        try:
+            await client.send_json(
+                {deviceid: {objectid: {"presentValue": confirmation.value}}}
+            )
+        except (ClientError, ConnectionError, RuntimeError) as err:
+            LOGGER.debug(
+                f"Websocket write to {deviceid}/{objectid} could not be sent: {err}"
+            )
+            self.websocket_write_fallbacks += 1
+            return False
+
+        return True
+
+    async def async_write_property(
+        self,
+        deviceid: str,
+        objectid: str,
+        propertyid: str | None,
+        value: str | int | float | bool | None,
+        array_index: int | None = None,
+        priority: int | None = None,
+        wait_for_confirmation: float | None = None,
+        lane: str = LANE_INTERACTIVE,
+    ) -> float | None:
+        """Write a property of an object through the add-on.
+
+        With wait_for_confirmation, return once a COV shows the device took the
+        value, or raise after that many seconds. Bulk writes go in their own
+        lane, behind the interactive ones.
+        """
+        propertyid = propertyid or "presentValue"
+        current = (
+            device.objects.get(objectid)
+            if (device := self.data.devices.get(deviceid)) is not None
+            else None
+        )
+
+        return await self._async_write(
+            deviceid,
+            objectid,
+            propertyid,
+            value,
+            array_index,
+            partial(
+                self.interface.write_property_v2,
+                deviceid=deviceid,
+                objectid=objectid,
+                propertyid=propertyid,
+                value=value,
+                array_index=array_index,
+                priority=priority,
+            ),
+            wait_for_confirmation,
+            lane,
+            # The websocket only takes a plain presentValue, that has to
+            # change so a COV acknowledges it.
+            over_websocket=(
+                propertyid == "presentValue"
+                and value is not None
+                and array_index is None
+                and priority is None
+                and current is not None
+                and not values_match(value, current.presentValue)
+            ),
+        )
+
+    async def async_write_release(
+        self,
+        deviceid: str,
+        objectid: str,
+        wait_for_confirmation: float | None = None,
+        lane: str = LANE_INTERACTIVE,
+    ) -> float | None:
+        """Write an empty presentValue to release manual control of an object."""
+        return await self._async_write(
+            deviceid,
+            objectid,
+            "presentValue",
+            None,
+            None,
+            partial(self.interface.write_property, deviceid=deviceid, objectid=objectid),
+            wait_for_confirmation,
+            lane,
+        )
+
+    async def _async_receive(self) -> None:
+        """Receive websocket messages until the connection is closed."""
+        client = self.interface._client  # pyright: ignore[reportPrivateUsage]
+
+        if client is None:
+            raise EcoPanelError("Not connected to the add-on WebSocket.")
+
+        while not client.closed:
+            message = await client.receive()
+
+            if message.type == WSMsgType.ERROR:
+                raise EcoPanelConnectionError(client.exception())
+
+            if message.type == WSMsgType.TEXT:
+                try:
+                    message_data, devices = await self._async_decode_devices(
+                        message.data
+                    )
+                except ValueError as err:
+                    LOGGER.warning(f"Received invalid JSON on websocket: {err}")
+                    continue
+                if not isinstance(message_data, dict):
+                    LOGGER.warning(f"Received data is not a device dict! {message_data}")
+                    continue
+                self._async_queue_message(message_data, devices)
+
+            if message.type in (
+                WSMsgType.CLOSE,
+                WSMsgType.CLOSED,
+                WSMsgType.CLOSING,
+            ):
+                raise EcoPanelConnectionClosed(
+                    "Connection to the add-on WebSocket has been closed."
+                )
+
+    def _is_urgent(
+        self, message_data: dict[str, Any], devices: dict[str, Device]
+    ) -> bool:
+        """Return if a message has objects that should not wait for the window.
+
+        These are alarm objects, objects in alarm or returning from it, and
+        objects with a write waiting for their COV.
+        """
+        for deviceid in devices:
+            records = self.records.get(deviceid, {})
+
+            for objectid, object_data in message_data[deviceid].items():
+                if not isinstance(object_data, dict):
+                    continue
+                if (deviceid, objectid) in self._confirmations:
+                    return True
+                if objectid.partition(":")[0] in ALARM_OBJECT_TYPES:
+                    return True
+                if object_data.get("eventState", "normal") != "normal":
+                    return True
+                if pack_status_flags(object_data.get("statusFlags")) & STATUS_IN_ALARM:
+                    return True
+                if (record := records.get(objectid)) is None:
+                    continue
+                if record.status & STATUS_IN_ALARM:
+                    return True
+
+        return False
+
+    @callback
+    def _async_queue_message(
+        self, message_data: dict[str, Any], devices: dict[str, Device]
+    ) -> None:
+        """Merge a websocket message into the pending ones, or handle it now.
+
+        Bursts of messages, like after a controller reboot, are merged during
+        the coalescing window and then handled in a single fan-out.
+        """
+        self.websocket_messages += 1
+
+        if not self.coalesce_window:
+            self._async_handle_message(message_data, devices)
+            return
+
+        if self._is_urgent(message_data, devices):
+            self.websocket_immediate += 1
+
+            # Pending data of these objects is older, so it must not be
+            # handled after this message.
+            for deviceid in devices:
+                if (pending := self._pending_messages.get(deviceid)) is None:
+                    continue
+                pending_objects = self._pending_devices[deviceid].objects
+                for objectid in message_data[deviceid]:
+                    pending.pop(objectid, None)
+                    pending_objects.pop(objectid, None)
+
+            self._async_handle_message(message_data, devices)
+            return
+
+        for deviceid, device in devices.items():
+            if (pending := self._pending_messages.get(deviceid)) is None:
+                self._pending_messages[deviceid] = dict(message_data[deviceid])
+                self._pending_devices[deviceid] = device
             else:
-                self.async_set_updated_data(data)
+                pending.update(message_data[deviceid])
+                self._pending_devices[deviceid].objects.update(device.objects)
+
+        if self._flush_timer is None:
+            self._flush_timer = self.hass.loop.call_later(
+                self.coalesce_window, self._async_flush_messages
+            )
+
+    @callback
+    def _async_flush_messages(self) -> None:
+        """Handle the merged websocket messages."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        if not self._pending_devices:
+            return
+
+        message_data, devices = self._pending_messages, self._pending_devices
+        self._pending_messages, self._pending_devices = {}, {}
+        self.websocket_flushes += 1
+
+        self._async_handle_message(message_data, devices)
+
+    @callback
+    def _use_websocket(self) -> None:
+        """Use websockets for updating"""
 
         async def listen() -> None:
             """Listen for state changes through websocket"""
@@ -66,6 +1257,7 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
                 await self.interface.connect()
             except EcoPanelError as e:
                 self.logger.info(e)
+                self._async_websocket_lost()
                 # If shutting down... shut down gracefully
                 if self.unsub:
                     self.unsub()
@@ -74,25 +1266,28 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
                 return
 
             LOGGER.debug("Connected websocket")
+            self._async_websocket_restored()
 
             try:
                 # This will stay running in the background.
-                # It calls DataUpdateCoordinator.async_set_updated_data when a message is received on the websocket.
-                # The data will then be accessable on coordinator.data where coordinator is the variable name of EcoPanelDataUpdateCoordinator.
-                await self.interface.listen(callback=check_data)
+                # Every message is merged into coordinator.data and only the entities
+                # of the objects in the message are notified.
+                await self._async_receive()
 
             except EcoPanelConnectionClosed as err:
-                self.last_update_success = False
                 self.logger.info(err)
             except EcoPanelError as err:
-                self.last_update_success = False
-                self.async_update_listeners()
                 self.logger.error(err)
             except Exception as err:
-                self.last_update_success = False
-                self.async_update_listeners()
                 self.logger.error(err)
 
+            # Whatever was received before the connection ended is still valid.
+            self._async_flush_messages()
+
+            # Devices are only marked unavailable once they stay silent for
+            # longer than the grace period, instead of all at once right now.
+            self._async_websocket_lost()
+
             LOGGER.debug("Disconnecting websocket after listening")
 
             # Make sure we are disconnected
@@ -119,13 +1314,70 @@ class EcoPanelDataUpdateCoordinator(DataUpdateCoordinator[DeviceDict]):
             self.hass, listen(), "bacnet-listen"
         )
 
-    async def _async_update_data(self) -> DeviceDict:
-        try:
-            devicedict = await self.interface.update(
-                full_update=not self.last_update_success
+    async def async_shutdown(self) -> None:
+        """Cancel the stale device check when the coordinator shuts down."""
+        await super().async_shutdown()
+        if self._unsub_stale_check is not None:
+            self._unsub_stale_check()
+            self._unsub_stale_check = None
+        self.property_cache.clear()
+        self.write_scheduler.shutdown()
+        self.stale_objects.shutdown()
+        self.profiler.shutdown()
+        self.memory.stop_tracing()
+
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        for pending in list(self._confirmations.values()):
+            for confirmation in list(pending):
+                self._expire_confirmation(
+                    (confirmation.deviceid, confirmation.objectid), confirmation
+                )
+
+        if self.interface.session is not None:
+            await self.interface.session.close()
+
+    async def _async_full_update(self) -> DeviceDict:
+        """Get all device data from the add-on in a single call."""
+        if not (payload := await self._async_fetch(API_JSON_URI)):
+            raise EcoPanelEmptyResponseError(
+                "The add-on API returned an empty response on full update"
             )
-        except (EcoPanelError, DeviceDictError) as error:
-            raise UpdateFailed(f"Invalid response from API: {error}") from error
+
+        data, devices = await self._async_decode_devices(payload)
+
+        if not data or not isinstance(data, dict):
+            raise EcoPanelEmptyResponseError(
+                "The add-on API returned an empty response on full update"
+            )
+
+        devicedict = DeviceDict({})
+        devicedict.devices.update(devices)
+
+        # Let the interface use this data instead of fetching it again on connect.
+        self.interface._device_dict = devicedict  # pyright: ignore[reportPrivateUsage]
+
+        return devicedict
+
+    async def _async_update_data(self) -> DeviceDict:
+        if self.data is not None and self.last_update_success:
+            # Websocket messages keep the data and the records up to date after
+            # the first update, so their last update times stay meaningful.
+            devicedict = self.data
+        else:
+            try:
+                devicedict = await self._async_full_update()
+            except (EcoPanelError, DeviceDictError, ValueError) as error:
+                raise UpdateFailed(f"Invalid response from API: {error}") from error
+
+            timestamp = monotonic()
+
+            with self.watchdog.section("records"):
+                for deviceid, device in devicedict.devices.items():
+                    self._update_records(deviceid, device)
+                    self._device_last_seen.setdefault(deviceid, timestamp)
 
         if not self.interface.connected and not self.unsub:
             self._use_websocket()
@@ -0,0 +1,54 @@
+"""Diagnostics support for the Bepacom BACnet/IP integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import EcoPanelDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "devices": len(coordinator.data.devices),
+        "objects": sum(len(records) for records in coordinator.records.values()),
+        "unavailable_devices": dict(coordinator.unavailable_devices),
+        "platforms": sorted(coordinator.platforms),
+        "device_registry_updates": coordinator.device_registry_updates,
+        "setup": coordinator.setup_stats.as_dict(),
+        "loop_watchdog": coordinator.watchdog.as_dict(),
+        "profiler": coordinator.profiler.as_dict(),
+        "memory": coordinator.memory.as_dict(),
+        "websocket_messages": {
+            "coalesce_window": coordinator.coalesce_window,
+            "received": coordinator.websocket_messages,
+            "immediate": coordinator.websocket_immediate,
+            "flushes": coordinator.websocket_flushes,
+        },
+        "stale_objects": coordinator.stale_objects.as_dict(),
+        "property_cache": {
+            "entries": len(coordinator.property_cache),
+            "bytes": coordinator.property_cache.size,
+            "hits": coordinator.property_cache.hits,
+            "misses": coordinator.property_cache.misses,
+        },
+        "write_latency": {
+            deviceid: histogram.as_dict()
+            for deviceid, histogram in coordinator.write_latency.items()
+        },
+        "http_pool": coordinator.http_pool.as_dict(),
+        "write_scheduler": coordinator.write_scheduler.as_dict(),
+        "write_paths": {
+            path: histogram.as_dict()
+            for path, histogram in coordinator.write_path_latency.items()
+        }
+        | {"websocket_fallbacks": coordinator.websocket_write_fallbacks},
+    }
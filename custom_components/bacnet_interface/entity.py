@@ -0,0 +1,134 @@
+"""Base entity for the Bepacom BACnet/IP integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from itertools import batched
+from sys import intern
+from time import monotonic
+from typing import Any
+
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    ATTR_ACTIVE_PRIORITY,
+    ATTR_PRIORITY_ARRAY,
+    CONF_WRITE_CONFIRMATION,
+    DOMAIN,
+    ENTITY_CHUNK_SIZE,
+)
+from .coordinator import EcoPanelDataUpdateCoordinator
+from .helper import active_priority
+from .models import ObjectRecord, StateOptions
+
+
+async def async_add_entities_chunked(
+    coordinator: EcoPanelDataUpdateCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    entities: Iterable[Entity],
+) -> None:
+    """Create and add entities in chunks, yielding to the event loop in between.
+
+    The entities are taken lazily from the iterable, so creating them is
+    spread over the chunks too.
+    """
+    started = monotonic()
+
+    for chunk in batched(entities, ENTITY_CHUNK_SIZE):
+        async_add_entities(chunk)
+
+        blocked = monotonic() - started
+        coordinator.setup_stats.observe_chunk(len(chunk), blocked)
+        if coordinator.watchdog.enabled:
+            coordinator.watchdog.observe("setup_chunk", blocked)
+
+        await asyncio.sleep(0)
+        started = monotonic()
+
+
+class EcoPanelEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator]):
+    """Base class for an entity that represents a single BACnet object."""
+
+    _state_options: StateOptions | None = None
+
+    def __init__(
+        self,
+        coordinator: EcoPanelDataUpdateCoordinator,
+        deviceid: str,
+        objectid: str,
+    ) -> None:
+        """Initialize the entity, listening to updates of its own object only."""
+        deviceid, objectid = intern(deviceid), intern(objectid)
+        super().__init__(coordinator=coordinator, context=(deviceid, objectid))
+        self.deviceid = deviceid
+        self.objectid = objectid
+        # The device itself is registered by the coordinator, only once.
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, deviceid)})
+
+    @property
+    def available(self) -> bool:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Return if the BACnet device of this entity is available."""
+        return (
+            super().available
+            and self.deviceid not in self.coordinator.unavailable_devices
+        )
+
+    @property
+    def record(self) -> ObjectRecord:
+        """Return the state the coordinator keeps for this BACnet object."""
+        return self.coordinator.records[self.deviceid][self.objectid]
+
+    @property
+    def state_options(self) -> StateOptions:
+        """Return the options of this multistate object.
+
+        Only built again when the stateText or numberOfStates changed.
+        """
+        obj = self.coordinator.data.devices[self.deviceid].objects[self.objectid]
+
+        if self._state_options is None or not self._state_options.matches(obj):
+            self._state_options = StateOptions.from_object(obj)
+
+        return self._state_options
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return self.record.status_attributes
+
+    async def async_update(self) -> None:
+        """Update the entity by refreshing only the BACnet device it belongs to."""
+        if not self.enabled:
+            return
+
+        await self.coordinator.async_refresh_device(self.deviceid)
+
+
+class EcoPanelCommandableEntity(EcoPanelEntity):
+    """Base class for an entity of a BACnet object that has a priorityArray.
+
+    The priorityArray is only shown once it was read on request, until the
+    next write or COV of the object invalidates it.
+    """
+
+    _unrecorded_attributes = frozenset({ATTR_PRIORITY_ARRAY, ATTR_ACTIVE_PRIORITY})
+
+    @property
+    def write_confirmation(self) -> float | None:
+        """Return how long writes wait for the device to confirm them, if at all."""
+        return self.coordinator.config_entry.data.get(CONF_WRITE_CONFIRMATION) or None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:  # pyright: ignore[reportIncompatibleMethodOverride]
+        attributes: dict[str, Any] = {**self.record.status_attributes}
+
+        if (
+            slots := self.coordinator.cached_priority_array(self.deviceid, self.objectid)
+        ) is not None:
+            attributes[ATTR_PRIORITY_ARRAY] = slots
+            attributes[ATTR_ACTIVE_PRIORITY] = active_priority(slots)
+
+        return attributes
@@ -0,0 +1,213 @@
+"""Memory snapshots of the integration and the aioecopanel library."""
+
+from __future__ import annotations
+
+import tracemalloc
+from collections import deque
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from sys import getsizeof
+from typing import TYPE_CHECKING, Any
+
+import aioecopanel
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, MEMORY_TRACE_FRAMES
+
+if TYPE_CHECKING:
+    from .coordinator import EcoPanelDataUpdateCoordinator
+
+# Allocations are attributed to the innermost frame in one of these packages.
+TRACED_PACKAGES = (
+    str(Path(__file__).parent),
+    str(Path(aioecopanel.__file__).parent),
+)
+
+# Allocation site "file:line" -> (bytes, blocks)
+type AllocationSites = dict[str, tuple[int, int]]
+
+
+def deep_size(value: Any, seen: set[int] | None = None) -> int:
+    """Estimate the memory used by a structure and everything it holds.
+
+    Only containers and dataclasses are followed, futures, handles and other
+    objects count with their own size, so references to the event loop or
+    Home Assistant do not pull everything else in. Containers are copied
+    before they are followed, so this can run in the executor while the
+    event loop keeps changing them.
+    """
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = getsizeof(value)
+
+    if isinstance(value, dict):
+        for key, item in tuple(value.items()):  # pyright: ignore[reportUnknownVariableType]
+            size += deep_size(key, seen) + deep_size(item, seen)
+    elif isinstance(value, list | tuple | set | frozenset | deque):
+        for item in tuple(value):  # pyright: ignore[reportUnknownVariableType]
+            size += deep_size(item, seen)
+    elif is_dataclass(value) and not isinstance(value, type):
+        if hasattr(value, "__dict__"):
+            size += deep_size(vars(value), seen)
+        else:
+            for field in fields(value):
+                size += deep_size(getattr(value, field.name), seen)
+
+    return size
+
+
+def deep_sizes(structures: dict[str, Any]) -> dict[str, int]:
+    """Estimate the memory used by each of the structures."""
+    return {name: deep_size(value) for name, value in structures.items()}
+
+
+class MemorySnapshots:
+    """Take tracemalloc snapshots of the integration and compare them.
+
+    Tracing starts with the first snapshot, so that snapshot only holds what
+    was allocated since; later ones show what the BACnet state costs and how
+    it grows. Every snapshot after the first writes its difference with the
+    previous one to the config directory.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: EcoPanelDataUpdateCoordinator
+    ) -> None:
+        """Initialize without any snapshots."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+        self._started_tracing = False
+        self._previous: AllocationSites | None = None
+        self._previous_time: datetime | None = None
+        self.snapshots = 0
+
+    async def async_snapshot(self, top: int, stop_tracing: bool) -> dict[str, Any]:
+        """Take a snapshot, and report the allocation sites and structures."""
+        tracing_started = not tracemalloc.is_tracing()
+        if tracing_started:
+            tracemalloc.start(MEMORY_TRACE_FRAMES)
+            self._started_tracing = True
+            LOGGER.info("Started tracing memory allocations")
+
+        now = dt_util.now()
+        sites = await self.hass.async_add_executor_job(_allocation_sites)
+
+        structures = await self.coordinator.async_memory_estimates()
+
+        diff = None
+        if self._previous is not None:
+            path = self.hass.config.path(
+                f"{DOMAIN}_memory_diff_{now.strftime('%Y%m%d_%H%M%S')}.txt"
+            )
+            diff = await self.hass.async_add_executor_job(
+                _write_diff, path, self._previous, self._previous_time, sites, now, top
+            )
+
+        self.snapshots += 1
+        if stop_tracing:
+            self.stop_tracing()
+        else:
+            self._previous, self._previous_time = sites, now
+
+        return {
+            "tracing_started": tracing_started,
+            "traced_bytes": sum(size for size, _ in sites.values()),
+            "traced_blocks": sum(count for _, count in sites.values()),
+            "sites": [
+                {"site": site, "bytes": size, "blocks": count}
+                for site, (size, count) in sorted(
+                    sites.items(), key=lambda item: item[1][0], reverse=True
+                )[:top]
+            ],
+            "structures": structures,
+            "diff": diff,
+        }
+
+    def stop_tracing(self) -> None:
+        """Forget the previous snapshot, and stop tracing if it was started here."""
+        self._previous = self._previous_time = None
+
+        if self._started_tracing:
+            self._started_tracing = False
+            tracemalloc.stop()
+            LOGGER.info("Stopped tracing memory allocations")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tracing state for diagnostics."""
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "started_here": self._started_tracing,
+            "snapshots": self.snapshots,
+        }
+
+
+def _allocation_sites() -> AllocationSites:
+    """Take a snapshot and sum the traced memory per allocation site."""
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(True, f"{package}/*", all_frames=True)
+            for package in TRACED_PACKAGES
+        ]
+        # Leave out what taking the snapshots costs.
+        + [tracemalloc.Filter(False, __file__, all_frames=True)]
+    )
+
+    sites: AllocationSites = {}
+    for trace in snapshot.traces:
+        # The most recent frame comes last.
+        for frame in reversed(trace.traceback):
+            if frame.filename.startswith(TRACED_PACKAGES):
+                site = f"{frame.filename}:{frame.lineno}"
+                break
+        else:
+            continue
+
+        size, count = sites.get(site, (0, 0))
+        sites[site] = (size + trace.size, count + 1)
+
+    return sites
+
+
+def _write_diff(
+    path: str,
+    previous: AllocationSites,
+    previous_time: datetime | None,
+    sites: AllocationSites,
+    now: datetime,
+    top: int,
+) -> dict[str, Any]:
+    """Write the growth per allocation site since the previous snapshot."""
+    changes: list[tuple[int, int, str]] = []
+    for site in previous.keys() | sites.keys():
+        size, count = sites.get(site, (0, 0))
+        previous_size, previous_count = previous.get(site, (0, 0))
+        if size != previous_size or count != previous_count:
+            changes.append((size - previous_size, count - previous_count, site))
+
+    changes.sort(key=lambda change: abs(change[0]), reverse=True)
+    size_diff = sum(change[0] for change in changes)
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(
+            f"Memory of {DOMAIN} and aioecopanel from {previous_time} to {now}: "
+            f"{size_diff:+} bytes\n\n"
+        )
+        for size, count, site in changes:
+            file.write(f"{size:+12} bytes {count:+8} blocks  {site}\n")
+
+    return {
+        "path": path,
+        "since": previous_time.isoformat() if previous_time is not None else None,
+        "bytes": size_diff,
+        "top": [
+            {"site": site, "bytes": size, "blocks": count}
+            for size, count, site in changes[:top]
+        ],
+    }
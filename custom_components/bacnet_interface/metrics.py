@@ -0,0 +1,146 @@
+"""Runtime metrics of the Bepacom BACnet/IP integration."""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientSession,
+    TraceConfig,
+    TraceRequestEndParams,
+    TraceRequestExceptionParams,
+    TraceRequestStartParams,
+)
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket
+# counts everything slower.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+@dataclass(slots=True)
+class SetupStats:
+    """How entities were added during setup, and the longest loop block it took."""
+
+    entities: int = 0
+    chunks: int = 0
+    longest_block: float = 0.0
+
+    def observe_chunk(self, entities: int, seconds: float) -> None:
+        """Count a chunk of entities created and added without yielding."""
+        self.entities += entities
+        self.chunks += 1
+        self.longest_block = max(self.longest_block, seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the setup stats for diagnostics."""
+        return {
+            "entities": self.entities,
+            "chunks": self.chunks,
+            "longest_block": round(self.longest_block, 3),
+        }
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Histogram of latencies in seconds, with timeouts counted apart."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    timeouts: int = 0
+
+    def observe(self, seconds: float) -> None:
+        """Count a latency."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        buckets = {f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.counts)}
+        buckets["slower"] = self.counts[-1]
+
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "max": round(self.max, 3),
+            "timeouts": self.timeouts,
+            "buckets": buckets,
+        }
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Requests through the connection pool of a session, from its trace signals.
+
+    Every request of the session is counted, reads, writes and the websocket
+    handshake alike. Requests in flight include those waiting for a connection,
+    queued counts the requests that had to wait because the pool was full.
+    """
+
+    limit: int
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    queued: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def trace_config(self) -> TraceConfig:
+        """Return the trace config that counts the requests of a session."""
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(self._async_request_start)
+        trace_config.on_request_end.append(self._async_request_end)
+        trace_config.on_request_exception.append(self._async_request_exception)
+        trace_config.on_connection_queued_start.append(self._async_queued)
+        return trace_config
+
+    async def _async_request_start(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestStartParams,
+    ) -> None:
+        context.started = monotonic()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def _async_request_end(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestEndParams,
+    ) -> None:
+        self.in_flight -= 1
+        self.latency.observe(monotonic() - context.started)
+
+    async def _async_request_exception(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestExceptionParams,
+    ) -> None:
+        self.in_flight -= 1
+        # The request timeouts cancel the request.
+        if isinstance(params.exception, (TimeoutError, asyncio.CancelledError)):
+            self.latency.timeouts += 1
+
+    async def _async_queued(
+        self, session: ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.queued += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the pool stats for diagnostics."""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queued": self.queued,
+            "latency": self.latency.as_dict(),
+        }
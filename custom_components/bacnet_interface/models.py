@@ -0,0 +1,282 @@
+"""Compact per-object state kept by the Bepacom BACnet/IP integration."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from math import isclose
+from sys import intern
+from typing import Any
+
+from aioecopanel import Object
+
+from .const import STATETEXT_OFFSET, WRITE_PATH_REST
+from .helper import decimal_places_needed
+
+STATUS_IN_ALARM = 1 << 0
+STATUS_FAULT = 1 << 1
+STATUS_OVERRIDDEN = 1 << 2
+STATUS_OUT_OF_SERVICE = 1 << 3
+
+BINARY_STATES = {"active": 1, "inactive": 0, "on": 1, "off": 0}
+
+ANALOG_OBJECT_TYPES = {"analogInput", "analogOutput", "analogValue"}
+BINARY_OBJECT_TYPES = {"binaryInput", "binaryOutput", "binaryValue"}
+MULTISTATE_OBJECT_TYPES = {"multiStateInput", "multiStateOutput", "multiStateValue"}
+
+# Object properties with string values that repeat across many objects.
+SHARED_STRING_PROPERTIES = (
+    "objectType",
+    "units",
+    "eventState",
+    "reliability",
+    "vendorName",
+    "modelName",
+)
+
+# statusFlags are shared between objects as tuples, there are only a few.
+_status_flags: dict[tuple[Any, ...], tuple[Any, ...]] = {}
+
+
+def compact_object(obj: Object) -> None:
+    """Share the values a received object has in common with other objects.
+
+    Repeated strings are interned and the statusFlags replaced by a shared
+    tuple, so tens of thousands of objects do not each hold their own copy.
+    Safe to run in the executor.
+    """
+    values = obj.__dict__
+
+    for name in SHARED_STRING_PROPERTIES:
+        if isinstance(value := values.get(name), str):
+            values[name] = intern(value)
+
+    if isinstance(identifier := obj.objectIdentifier, list) and identifier:
+        if isinstance(identifier[0], str):
+            identifier[0] = intern(identifier[0])
+
+    if isinstance(status_flags := obj.statusFlags, list):
+        status_flags = tuple(status_flags)
+        obj.statusFlags = _status_flags.setdefault(status_flags, status_flags)
+    elif isinstance(status_flags, str):
+        obj.statusFlags = intern(status_flags)
+
+
+def pack_status_flags(status_flags: str | list[Any] | None) -> int:
+    """Pack the four BACnet statusFlags into a single integer."""
+    if not status_flags:
+        return 0
+
+    packed = 0
+    for bit, flag in enumerate(status_flags[:4]):
+        if flag == "1" if isinstance(flag, str) else bool(flag):
+            packed |= 1 << bit
+
+    return packed
+
+
+def binary_value(present_value: Any) -> bool | None:
+    """Return the presentValue of a binary object as a bool."""
+    if isinstance(present_value, str):
+        if (state := BINARY_STATES.get(present_value.lower())) is not None:
+            return state == 1
+        if present_value in {"1", "0"}:
+            return present_value == "1"
+        return None
+
+    if isinstance(present_value, int):
+        return present_value == 1
+
+    return None
+
+
+def analog_value(present_value: Any) -> float | None:
+    """Return the presentValue of an analog object as a float."""
+    try:
+        return float(present_value)
+    except (TypeError, ValueError):
+        return None
+
+
+def round_analog(value: float, obj: Object) -> int | float:
+    """Round an analog value to the resolution or covIncrement of its object."""
+    for precision in (obj.resolution, obj.covIncrement):
+        if not isinstance(precision, int | float) or precision <= 0:
+            continue
+        if precision >= 1:
+            return int(value)
+        return round(value, decimal_places_needed(precision))
+
+    return round(value, 1)
+
+
+def multistate_value(present_value: Any) -> int | None:
+    """Return the presentValue of a multistate object as a state number."""
+    try:
+        return int(present_value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class ObjectRecord:
+    """State the integration keeps for a single BACnet object.
+
+    Slotted so that tens of thousands of records stay small, and holding
+    only what the BACnet object does not: the records are kept by device and
+    object identifier, the other properties are read from the object itself.
+    The presentValue is normalised once per update, into a float for analog,
+    a bool for binary and a state number for multistate objects, so entities
+    do not convert it on every read.
+    """
+
+    object_type: str
+    status: int = 0
+    last_update: float = 0.0
+    stale: bool = False
+    value: Any = None
+    # Analog values rounded to the resolution of the object.
+    rounded: int | float | None = None
+
+    @classmethod
+    def from_object(cls, objectid: str, obj: Object, timestamp: float) -> ObjectRecord:
+        """Create a record for a BACnet object."""
+        record = cls(intern(objectid.partition(":")[0]))
+        record.update(obj, timestamp)
+        return record
+
+    def update(self, obj: Object, timestamp: float) -> None:
+        """Update the record from a newly received BACnet object."""
+        self.status = pack_status_flags(obj.statusFlags)
+        self.last_update = timestamp
+        self.stale = False
+
+        present_value = obj.presentValue
+        object_type = self.object_type
+
+        if object_type in ANALOG_OBJECT_TYPES:
+            self.value = value = analog_value(present_value)
+            self.rounded = round_analog(value, obj) if value is not None else None
+        elif object_type in BINARY_OBJECT_TYPES:
+            self.value = binary_value(present_value)
+        elif object_type in MULTISTATE_OBJECT_TYPES:
+            self.value = multistate_value(present_value)
+        else:
+            self.value = present_value
+
+    @property
+    def status_attributes(self) -> dict[str, bool]:
+        """Return the statusFlags and staleness as entity state attributes."""
+        return {
+            "inAlarm": bool(self.status & STATUS_IN_ALARM),
+            "fault": bool(self.status & STATUS_FAULT),
+            "overridden": bool(self.status & STATUS_OVERRIDDEN),
+            "outOfService": bool(self.status & STATUS_OUT_OF_SERVICE),
+            "stale": self.stale,
+        }
+
+
+@dataclass(slots=True)
+class StateOptions:
+    """Options of a multistate object, with the presentValue of every option.
+
+    Built once per stateText and numberOfStates of the object, so looking up
+    the option of a presentValue or the value of an option takes no work.
+    """
+
+    state_text: list[Any] | None
+    number_of_states: int | None
+    options: list[str]
+    values: dict[str, int]
+
+    @classmethod
+    def from_object(cls, obj: Object) -> StateOptions:
+        """Build the options from the stateText or numberOfStates of an object."""
+        state_text, number_of_states = obj.stateText, obj.numberOfStates
+
+        if state_text and any(state_text):
+            options = state_text
+        elif number_of_states:
+            options = [str(i) for i in range(1, number_of_states + 1)]
+        else:
+            options = []
+
+        values: dict[str, int] = {}
+        for index, option in enumerate(options):
+            # The first of duplicate texts wins, like list.index would.
+            values.setdefault(option, index + STATETEXT_OFFSET)
+
+        return cls(state_text, number_of_states, options, values)
+
+    @property
+    def from_state_text(self) -> bool:
+        """Return if the options are the stateText of the object."""
+        return bool(self.state_text) and self.options is self.state_text
+
+    def matches(self, obj: Object) -> bool:
+        """Return if the options are still those of the object."""
+        state_text = obj.stateText
+        return obj.numberOfStates == self.number_of_states and (
+            state_text is self.state_text or state_text == self.state_text
+        )
+
+    def option(self, state: int | None) -> str | None:
+        """Return the option of a state number, if there is one."""
+        if state is None:
+            return None
+
+        if 0 <= (index := state - STATETEXT_OFFSET) < len(self.options):
+            return self.options[index]
+
+        return None
+
+
+def values_match(written: Any, reported: Any) -> bool:
+    """Return if a reported value is the value that was written."""
+    if written == reported:
+        return True
+
+    if isinstance(reported, str) and reported.lower() in BINARY_STATES:
+        reported = BINARY_STATES[reported.lower()]
+    if isinstance(written, str) and written.lower() in BINARY_STATES:
+        written = BINARY_STATES[written.lower()]
+
+    try:
+        return isclose(float(written), float(reported), rel_tol=1e-6, abs_tol=1e-3)
+    except (TypeError, ValueError):
+        return str(written).lower() == str(reported).lower()
+
+
+@dataclass(slots=True)
+class WriteConfirmation:
+    """A write that waits for a COV showing the device took the value."""
+
+    deviceid: str
+    objectid: str
+    propertyid: str
+    value: Any
+    started: float
+    future: asyncio.Future[float | None]
+    timer: asyncio.TimerHandle | None = None
+    path: str = WRITE_PATH_REST
+    array_index: int | None = None
+
+    def matches(self, properties: dict[str, Any]) -> bool:
+        """Return if a COV with these properties confirms the write."""
+        if self.value is None:
+            # A release may change any property, any COV confirms it.
+            return True
+
+        if self.propertyid not in properties:
+            # Only the written property itself shows the device took it.
+            return False
+
+        reported = properties[self.propertyid]
+        if self.array_index is not None:
+            if not isinstance(reported, list) or not 0 < self.array_index <= len(
+                reported
+            ):
+                return False
+            reported = reported[self.array_index - 1]
+
+        return values_match(self.value, reported)
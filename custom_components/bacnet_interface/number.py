@@ -1,4 +1,4 @@
-from typing import Any
+from collections.abc import Iterator
 
 from homeassistant.components.number import (
     NumberEntity,
@@ -10,13 +10,13 @@ from homeassistant.const import (
     CONF_NAME,
 )
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.number import NumberMode
 
 from .const import CONF_ANALOG_OUTPUT, CONF_ANALOG_VALUE, DOMAIN, LOGGER
 from .coordinator import EcoPanelDataUpdateCoordinator
+from .entity import EcoPanelCommandableEntity, async_add_entities_chunked
 from .helper import bacnet_to_device_class, bacnet_to_ha_units, key_to_property
 
 
@@ -27,19 +27,25 @@ async def async_setup_entry(
 ) -> None:
     """Set up EcoPanel sensor based on a config entry."""
     coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entity_list: list[NumberEntity] = []
 
-    # Collect from all devices the objects that can become a sensor
+    await async_add_entities_chunked(
+        coordinator, async_add_entities, _entities(coordinator)
+    )
+
+
+def _entities(coordinator: EcoPanelDataUpdateCoordinator) -> Iterator[Entity]:
+    """Yield an entity for every object that can become a number."""
     if not coordinator.data.devices:
         LOGGER.warning("No devices received from API!")
         return
 
-    for deviceid in coordinator.data.devices:
+    # Copied, as messages may add devices and objects between the chunks.
+    for deviceid in list(coordinator.data.devices):
         if not coordinator.data.devices[deviceid].objects:
             LOGGER.warning(f"No objects in {deviceid}!")
             continue
 
-        for objectid in coordinator.data.devices[deviceid].objects:
+        for objectid in list(coordinator.data.devices[deviceid].objects):
             if (
                 not coordinator.data.devices[deviceid]
                 .objects[objectid]
@@ -53,27 +59,19 @@ async def async_setup_entry(
                 == "analogOutput"
             ):
                 # Object Type to ObjectIdentifier[0]
-                entity_list.append(
-                    AnalogOutputEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield AnalogOutputEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
             elif (
                 coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
                 == "analogValue"
             ):
-                entity_list.append(
-                    AnalogValueEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield AnalogValueEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
 
-    async_add_entities(entity_list)
-
 
-class AnalogOutputEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], NumberEntity
-):
+class AnalogOutputEntity(EcoPanelCommandableEntity, NumberEntity):
     _attr_has_entity_name = True
     _attr_icon = "mdi:gesture-swipe-vertical"
 
@@ -84,9 +82,7 @@ class AnalogOutputEntity(
         objectid: str,
     ):
         """Initialize a BACnet AnalogOutput object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
 
     @property
     def unique_id(self) -> str:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -143,11 +139,8 @@ class AnalogOutputEntity(
 
     @property
     def native_value(self):
-        value = float(
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
+        if (value := self.record.value) is None:
+            return None
 
         if self.native_step >= 1:
             return int(value)
@@ -206,44 +199,6 @@ class AnalogOutputEntity(
         else:
             return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
-
     async def async_set_native_value(self, value: float) -> None:
         """Set analogOutput object to active."""
 
@@ -251,17 +206,18 @@ class AnalogOutputEntity(
             CONF_ANALOG_OUTPUT, "present_value"
         )
 
-        await self.coordinator.interface.write_property_v2(
+        await self.coordinator.async_write_property(
             deviceid=self.deviceid,
             objectid=self.objectid,
             propertyid=key_to_property(propertyid),
             value=value,
             array_index=None,
             priority=None,
+            wait_for_confirmation=self.write_confirmation,
         )
 
 
-class AnalogValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], NumberEntity):
+class AnalogValueEntity(EcoPanelCommandableEntity, NumberEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -271,9 +227,7 @@ class AnalogValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Number
         objectid: str,
     ):
         """Initialize a BACnet AnalogValue object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
 
     @property
     def unique_id(self) -> str:
@@ -334,11 +288,8 @@ class AnalogValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Number
 
     @property
     def native_value(self):
-        value = float(
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
+        if (value := self.record.value) is None:
+            return None
 
         if self.native_step >= 1:
             return int(value)
@@ -397,44 +348,6 @@ class AnalogValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Number
         else:
             return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
-
     async def async_set_native_value(self, value: float) -> None:
         """Set analogOutput object to active."""
 
@@ -442,11 +355,12 @@ class AnalogValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Number
             CONF_ANALOG_VALUE, "present_value"
         )
 
-        await self.coordinator.interface.write_property_v2(
+        await self.coordinator.async_write_property(
             deviceid=self.deviceid,
             objectid=self.objectid,
             propertyid=key_to_property(propertyid),
             value=value,
             array_index=None,
             priority=None,
+            wait_for_confirmation=self.write_confirmation,
         )
@@ -0,0 +1,148 @@
+"""Profiling of the message handling of the integration on a live site."""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, PROFILE_TOP_FUNCTIONS
+
+
+class MessageProfiler:
+    """Profile the coordinator's message handling for a bounded duration.
+
+    The profiler is only enabled inside the sections it wraps, so the
+    profile shows the decoding, merging and entity updates of the
+    integration instead of everything else running on the event loop.
+    Decoding in the executor runs in another thread and is not profiled.
+    The result is a pstats file in the config directory, which snakeviz,
+    flameprof and similar tools turn into a flame graph.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler without a session."""
+        self.hass = hass
+
+        self._profile: cProfile.Profile | None = None
+        self._in_section = False
+        self._started = 0.0
+        self._duration = 0.0
+        self._sections = 0
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+        self.last_result: dict[str, Any] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return if a profiling session is running."""
+        return self._profile is not None
+
+    @contextmanager
+    def section(self) -> Iterator[None]:
+        """Profile a synchronous section, if a session is running."""
+        if (profile := self._profile) is None or self._in_section:
+            yield
+            return
+
+        self._in_section = True
+        self._sections += 1
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._in_section = False
+
+    @callback
+    def async_start(self, duration: float) -> None:
+        """Start a session that stops by itself after the duration."""
+        self._profile = cProfile.Profile()
+        self._started = monotonic()
+        self._duration = duration
+        self._sections = 0
+
+        async def _async_stop(_: datetime) -> None:
+            self._unsub_stop = None
+            await self.async_stop()
+
+        self._unsub_stop = async_call_later(self.hass, duration, _async_stop)
+
+        LOGGER.info(f"Profiling message handling for {duration} s")
+
+    async def async_stop(self) -> dict[str, Any] | None:
+        """Stop the session and write the profile to the config directory."""
+        if (profile := self._profile) is None:
+            return None
+
+        self._profile = None
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+
+        duration = monotonic() - self._started
+        path = self.hass.config.path(
+            f"{DOMAIN}_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.prof"
+        )
+        total_calls, top = await self.hass.async_add_executor_job(
+            _dump_profile, profile, path
+        )
+
+        self.last_result = {
+            "path": path,
+            "duration": round(duration, 1),
+            "sections": self._sections,
+            "calls": total_calls,
+            "top": top,
+        }
+
+        LOGGER.info(f"Wrote the profile of the message handling to {path}")
+        return self.last_result
+
+    def shutdown(self) -> None:
+        """Drop a running session without writing it."""
+        self._profile = None
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the running session and the last result for diagnostics."""
+        return {
+            "running": self.running,
+            "elapsed": round(monotonic() - self._started, 1) if self.running else None,
+            "duration": self._duration if self.running else None,
+            "last_result": self.last_result,
+        }
+
+
+def _dump_profile(
+    profile: cProfile.Profile, path: str
+) -> tuple[int, list[dict[str, Any]]]:
+    """Write a profile as pstats file and return its most expensive functions."""
+    profile.dump_stats(path)
+
+    stats = pstats.Stats(profile)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+
+    top = []
+    for func in stats.fcn_list[:PROFILE_TOP_FUNCTIONS]:  # type: ignore[attr-defined]
+        _, calls, total, cumulative, _ = stats.stats[func]  # type: ignore[attr-defined]
+        top.append(
+            {
+                "function": pstats.func_std_string(func),
+                "calls": calls,
+                "total": round(total, 4),
+                "cumulative": round(cumulative, 4),
+            }
+        )
+
+    return stats.total_calls, top  # type: ignore[attr-defined]
@@ -0,0 +1,181 @@
+"""Scheduling of writes to BACnet devices through the add-on."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from dataclasses import dataclass
+from itertools import chain
+from time import monotonic
+from typing import Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import LANE_BULK, LANE_INTERACTIVE
+from .metrics import LatencyHistogram
+
+LANES = (LANE_INTERACTIVE, LANE_BULK)
+
+
+class WriteQueueFullError(HomeAssistantError):
+    """Raised when a write is rejected because its lane is full."""
+
+
+@dataclass(slots=True)
+class QueuedWrite:
+    """A write waiting for its turn."""
+
+    deviceid: str
+    submitted: float
+    turn: asyncio.Future[None]
+
+
+class WriteScheduler:
+    """Decide when writes may go out to the add-on.
+
+    Interactive writes always go ahead of bulk writes. Every device has at
+    most a few writes in flight, a device that is busy does not hold up the
+    others, and a token bucket limits the rate of all writes together, as
+    they all share the BACnet network of the add-on.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        device_concurrency: int,
+        rate: float,
+        burst: int,
+        queue_sizes: Mapping[str, int],
+    ) -> None:
+        """Initialize the scheduler with empty lanes and a full bucket."""
+        self.loop = loop
+        self.device_concurrency = device_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.queue_sizes = queue_sizes
+
+        self._lanes: dict[str, deque[QueuedWrite]] = {lane: deque() for lane in LANES}
+        self._in_flight: dict[str, int] = {}
+        self._tokens = float(burst)
+        self._refilled = monotonic()
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.wait_time = {lane: LatencyHistogram() for lane in LANES}
+        self.peak_depth = dict.fromkeys(LANES, 0)
+        self.rejected = dict.fromkeys(LANES, 0)
+
+    async def async_run[_T](
+        self, deviceid: str, lane: str, write: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a write once it is its turn."""
+        queue = self._lanes[lane]
+
+        if len(queue) >= self.queue_sizes[lane]:
+            self.rejected[lane] += 1
+            raise WriteQueueFullError(
+                f"Too many {lane} writes waiting, the write to {deviceid} was rejected"
+            )
+
+        entry = QueuedWrite(deviceid, monotonic(), self.loop.create_future())
+        queue.append(entry)
+        self.peak_depth[lane] = max(self.peak_depth[lane], len(queue))
+        self._dispatch()
+
+        try:
+            await entry.turn
+        except asyncio.CancelledError:
+            # A write that is still queued is dropped by _dispatch, one that
+            # already got its turn gives it back.
+            if not entry.turn.cancelled():
+                self._release(deviceid)
+            raise
+
+        self.wait_time[lane].observe(monotonic() - entry.submitted)
+
+        try:
+            return await write()
+        finally:
+            self._release(deviceid)
+
+    def _release(self, deviceid: str) -> None:
+        """Free the slot of a finished write and start the next ones."""
+        if (in_flight := self._in_flight[deviceid] - 1) > 0:
+            self._in_flight[deviceid] = in_flight
+        else:
+            del self._in_flight[deviceid]
+
+        self._dispatch()
+
+    def _take_token(self) -> bool:
+        """Take a token from the bucket if there is one."""
+        now = monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
+
+    def _on_timer(self) -> None:
+        """Continue dispatching once a token is available again."""
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Give writes their turn, lane by lane, while devices and tokens allow."""
+        for lane in LANES:
+            queue = self._lanes[lane]
+            waiting: deque[QueuedWrite] = deque()
+
+            while queue:
+                entry = queue.popleft()
+
+                if entry.turn.done():
+                    # Cancelled while waiting.
+                    continue
+
+                if self._in_flight.get(entry.deviceid, 0) >= self.device_concurrency:
+                    waiting.append(entry)
+                    continue
+
+                if not self._take_token():
+                    waiting.append(entry)
+                    waiting.extend(queue)
+                    self._lanes[lane] = waiting
+                    if self._timer is None:
+                        self._timer = self.loop.call_later(
+                            (1 - self._tokens) / self.rate, self._on_timer
+                        )
+                    return
+
+                self._in_flight[entry.deviceid] = (
+                    self._in_flight.get(entry.deviceid, 0) + 1
+                )
+                entry.turn.set_result(None)
+
+            self._lanes[lane] = waiting
+
+    def queued(self) -> Iterator[QueuedWrite]:
+        """Return the writes waiting for their turn, in any lane."""
+        return chain.from_iterable(self._lanes.values())
+
+    def shutdown(self) -> None:
+        """Stop the token timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue depths and wait times for diagnostics."""
+        return {
+            lane: {
+                "depth": len(self._lanes[lane]),
+                "peak_depth": self.peak_depth[lane],
+                "rejected": self.rejected[lane],
+                "wait_time": self.wait_time[lane].as_dict(),
+            }
+            for lane in LANES
+        } | {"in_flight": dict(self._in_flight), "tokens": round(self._tokens, 1)}
@@ -1,22 +1,20 @@
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
-from typing import Any
 
 from homeassistant.components.select import (SelectEntity,
                                              SelectEntityDescription)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ENABLED, CONF_NAME
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity import Entity, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.dt import utcnow
 
-from .const import STATETEXT_OFFSET  # JCO
 from .const import (CONF_MULTISTATE_OUTPUT, CONF_MULTISTATE_VALUE, DOMAIN,
                     LOGGER)
 from .coordinator import EcoPanelDataUpdateCoordinator
+from .entity import EcoPanelCommandableEntity, async_add_entities_chunked
 from .helper import key_to_property
 
 
@@ -27,10 +25,16 @@ async def async_setup_entry(
 ) -> None:
     """Set up EcoPanel sensor based on a config entry."""
     coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entity_list: list = []
 
-    # Collect from all devices the objects that can become a select.
-    for deviceid in coordinator.data.devices:
+    await async_add_entities_chunked(
+        coordinator, async_add_entities, _entities(coordinator)
+    )
+
+
+def _entities(coordinator: EcoPanelDataUpdateCoordinator) -> Iterator[Entity]:
+    """Yield an entity for every object that can become a select."""
+    # Copied, as messages may add devices and objects between the chunks.
+    for deviceid in list(coordinator.data.devices):
         if deviceid is None:
             LOGGER.warning(f"Device ID is None!")
             continue
@@ -39,7 +43,7 @@ async def async_setup_entry(
             LOGGER.warning(f"No objects in {deviceid}!")
             continue
 
-        for objectid in coordinator.data.devices[deviceid].objects:
+        for objectid in list(coordinator.data.devices[deviceid].objects):
             if (
                 not coordinator.data.devices[deviceid]
                 .objects[objectid]
@@ -61,10 +65,8 @@ async def async_setup_entry(
                     )
                     continue
 
-                entity_list.append(
-                    MultiStateValueEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield MultiStateValueEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
             elif (
                 coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
@@ -79,18 +81,12 @@ async def async_setup_entry(
                     )
                     continue
 
-                entity_list.append(
-                    MultiStateOutputEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield MultiStateOutputEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
 
-    async_add_entities(entity_list)
-
 
-class MultiStateOutputEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], SelectEntity
-):
+class MultiStateOutputEntity(EcoPanelCommandableEntity, SelectEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -100,9 +96,7 @@ class MultiStateOutputEntity(
         objectid: str,
     ):
         """Initialize a BACnet MultiStateOutput object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
 
     @property
     def unique_id(self) -> str:
@@ -134,112 +128,43 @@ class MultiStateOutputEntity(
 
     @property
     def options(self) -> list:
-        if (
-            state_text := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .stateText
-        ):
-            if any(state_text):
-                return state_text
-
-        if (
-            number_of_states := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .numberOfStates
-        ):
-            return [str(i) for i in range(1, number_of_states + 1)]
-
-        else:
+        if not (options := self.state_options.options):
             LOGGER.error(
                 f"{self.deviceid} {self.objectid} is missing REQUIRED numberOfStates property!"
             )
-            return []
+
+        return options
 
     @property
-    def current_option(self) -> str:
-        pres_val = int(
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
+    def current_option(self) -> str | None:
+        pres_val = self.record.value
 
-        if (
-            state_text := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .stateText
-        ):
-            if any(state_text):
-                return state_text[pres_val - STATETEXT_OFFSET]
-        if (
-            number_of_states := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .numberOfStates
-        ):
-            options = [str(i) for i in range(1, number_of_states + 1)]
-            return options[pres_val - STATETEXT_OFFSET]
-        else:
+        if not (state_options := self.state_options).options:
             return str(pres_val)
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
+        return state_options.option(pres_val)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
 
-        pres_val = self.options.index(option) + STATETEXT_OFFSET
+        pres_val = self.state_options.values[option]
 
         propertyid = self.coordinator.config_entry.data.get(
             CONF_MULTISTATE_OUTPUT, "present_value"
         )
 
-        await self.coordinator.interface.write_property_v2(
+        await self.coordinator.async_write_property(
             deviceid=self.deviceid,
             objectid=self.objectid,
             propertyid=key_to_property(propertyid),
             value=pres_val,
             array_index=None,
             priority=None,
+            wait_for_confirmation=self.write_confirmation,
         )
 
 
-class MultiStateValueEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], SelectEntity
-):
+class MultiStateValueEntity(EcoPanelCommandableEntity, SelectEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -249,9 +174,7 @@ class MultiStateValueEntity(
         objectid: str,
     ):
         """Initialize a BACnet MultiStateValue object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
 
     @property
     def unique_id(self) -> str:
@@ -283,104 +206,37 @@ class MultiStateValueEntity(
 
     @property
     def options(self) -> list:
-        if (
-            state_text := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .stateText
-        ):
-            if any(state_text):
-                return state_text
-
-        if (
-            number_of_states := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .numberOfStates
-        ):
-            return [str(i) for i in range(1, number_of_states + 1)]
-
-        else:
+        if not (options := self.state_options.options):
             LOGGER.error(
                 f"{self.deviceid} {self.objectid} is missing REQUIRED numberOfStates property!"
             )
-            return []
+
+        return options
 
     @property
-    def current_option(self) -> str:
-        pres_val = int(
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
+    def current_option(self) -> str | None:
+        pres_val = self.record.value
 
-        if (
-            state_text := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .stateText
-        ):
-            if any(state_text):
-                return state_text[pres_val - STATETEXT_OFFSET]
-        if (
-            number_of_states := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .numberOfStates
-        ):
-            options = [str(i) for i in range(1, number_of_states + 1)]
-            return options[pres_val - STATETEXT_OFFSET]
-        else:
+        if not (state_options := self.state_options).options:
             return str(pres_val)
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
+        return state_options.option(pres_val)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
 
-        pres_val = self.options.index(option) + STATETEXT_OFFSET
+        pres_val = self.state_options.values[option]
 
         propertyid = self.coordinator.config_entry.data.get(
             CONF_MULTISTATE_VALUE, "present_value"
         )
 
-        await self.coordinator.interface.write_property_v2(
+        await self.coordinator.async_write_property(
             deviceid=self.deviceid,
             objectid=self.objectid,
             propertyid=key_to_property(propertyid),
             value=pres_val,
             array_index=None,
             priority=None,
+            wait_for_confirmation=self.write_confirmation,
         )
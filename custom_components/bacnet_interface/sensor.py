@@ -1,18 +1,19 @@
+from collections.abc import Iterator
+from time import monotonic
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.sensor.const import DEVICE_CLASS_UNITS
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ENABLED, CONF_NAME, UnitOfEnergy, UnitOfVolume
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.const import CONF_ENABLED, CONF_NAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import STATETEXT_OFFSET
-from .const import DOMAIN, LOGGER
+from .const import ATTR_STATE_INTERVAL, ATTR_STATISTICS_ONLY, DOMAIN, LOGGER
 from .coordinator import EcoPanelDataUpdateCoordinator
-from .helper import bacnet_to_device_class, bacnet_to_ha_units, decimal_places_needed
+from .entity import EcoPanelEntity, async_add_entities_chunked
+from .helper import bacnet_to_device_class, bacnet_to_ha_units, is_meter_unit
 
 
 async def async_setup_entry(
@@ -22,15 +23,21 @@ async def async_setup_entry(
 ) -> None:
     """Set up EcoPanel sensor based on a config entry."""
     coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entity_list: list[Entity] = []
 
-    # Collect from all devices the objects that can become a sensor
-    for deviceid in coordinator.data.devices:
+    await async_add_entities_chunked(
+        coordinator, async_add_entities, _entities(coordinator)
+    )
+
+
+def _entities(coordinator: EcoPanelDataUpdateCoordinator) -> Iterator[Entity]:
+    """Yield an entity for every object that can become a sensor."""
+    # Copied, as messages may add devices and objects between the chunks.
+    for deviceid in list(coordinator.data.devices):
         if not coordinator.data.devices[deviceid].objects:
             LOGGER.warning(f"No objects in {deviceid}!")
             continue
 
-        for objectid in coordinator.data.devices[deviceid].objects:
+        for objectid in list(coordinator.data.devices[deviceid].objects):
             if (
                 not coordinator.data.devices[deviceid]
                 .objects[objectid]
@@ -43,29 +50,23 @@ async def async_setup_entry(
                 coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
                 == "analogInput"
             ):
-                entity_list.append(
-                    AnalogInputEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield AnalogInputEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
             # elif coordinator.data.devices[deviceid].objects[objectid].objectType == 'accumulator':
-            #    entity_list.append(AnalogInputEntity(coordinator=coordinator, deviceid=deviceid, objectid=objectid))
+            #    yield AnalogInputEntity(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
             # elif coordinator.data.devices[deviceid].objects[objectid].objectType == 'averaging':
-            #    entity_list.append(AveragingEntity(coordinator=coordinator, deviceid=deviceid, objectid=objectid))
+            #    yield AveragingEntity(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
             elif (
                 coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
                 == "multiStateInput"
             ):
-                entity_list.append(
-                    MultiStateInputEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield MultiStateInputEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
 
-    async_add_entities(entity_list)
 
-
-class AnalogInputEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], SensorEntity):
+class AnalogInputEntity(EcoPanelEntity, SensorEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -75,9 +76,58 @@ class AnalogInputEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Sensor
         objectid: str,
     ):
         """Initialize a BACnet AnalogInput object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
+        self._last_state_write = 0.0
+        self._last_available: bool | None = None
+
+    @property
+    def statistics_options(self) -> dict[str, Any] | None:
+        """Return the statistics mode options if this point only keeps statistics."""
+        if self.registry_entry is None:
+            return None
+
+        options = self.registry_entry.options.get(DOMAIN)
+        if not options or not options.get(ATTR_STATISTICS_ONLY):
+            return None
+
+        return dict(options)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Feed statistics directly and write the state only now and then."""
+        if (options := self.statistics_options) is None:
+            super()._handle_coordinator_update()
+            return
+
+        available = self.available
+        if available and (value := self.record.value) is not None:
+            self.coordinator.statistics.async_add(
+                self.entity_id,
+                value,
+                self._has_sum,
+                self.native_unit_of_measurement,
+            )
+
+        now = monotonic()
+        interval = options.get(ATTR_STATE_INTERVAL)
+
+        if available != self._last_available or (
+            interval and now - self._last_state_write >= interval
+        ):
+            self._last_state_write = now
+            self._last_available = available
+            self.async_write_ha_state()
+
+    @callback
+    def async_registry_entry_updated(self) -> None:
+        """Stop compiling statistics when the statistics mode is switched off."""
+        if self.statistics_options is None:
+            self.coordinator.statistics.async_remove(self.entity_id)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop compiling statistics of this point."""
+        await super().async_will_remove_from_hass()
+        self.coordinator.statistics.async_remove(self.entity_id)
 
     @property
     def unique_id(self) -> str:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -105,32 +155,7 @@ class AnalogInputEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Sensor
 
     @property
     def native_value(self):  # pyright: ignore[reportIncompatibleMethodOverride]
-        value = (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
-
-        if (
-            resolution := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .resolution
-        ):
-            if resolution >= 1:
-                return int(value)
-            resolution = decimal_places_needed(resolution)
-            return round(value, resolution)
-        elif (
-            covIncrement := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .covIncrement
-        ):
-            if covIncrement >= 1:
-                return int(value)
-            covIncrement = decimal_places_needed(covIncrement)
-            return round(value, covIncrement)
-
-        return round(value, 1)
+        return self.record.rounded
 
     @property
     def icon(self):  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -162,56 +187,23 @@ class AnalogInputEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Sensor
             return None
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
-
-    @property
-    def device_info(self) -> DeviceInfo:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
+    def _has_sum(self) -> bool:
+        """Return if this point is a meter."""
+        return is_meter_unit(self.native_unit_of_measurement)
 
     @property
-    def state_class(self) -> str:  # pyright: ignore[reportIncompatibleMethodOverride]
-        if self.native_unit_of_measurement in UnitOfEnergy:
-            return "total"
-        elif self.native_unit_of_measurement in UnitOfVolume:
+    def state_class(self) -> str | None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        if self.statistics_options is not None:
+            # The statistics are imported directly, the recorder must not
+            # compile its own from the few states that are written.
+            return None
+        elif self._has_sum:
             return "total"
         else:
             return "measurement"
 
 
-class MultiStateInputEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], SensorEntity
-):
+class MultiStateInputEntity(EcoPanelEntity, SensorEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -221,9 +213,7 @@ class MultiStateInputEntity(
         objectid: str,
     ):
         """Initialize a BACnet MultiStateInput object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
 
     @property
     def unique_id(self) -> str:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -251,59 +241,13 @@ class MultiStateInputEntity(
 
     @property
     def native_value(self):  # pyright: ignore[reportIncompatibleMethodOverride]
-        state_val = (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
+        state_val = self.record.value
 
-        if (
-            state_text := self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .stateText
-        ):
-            return state_text[state_val - STATETEXT_OFFSET]  # JCO
+        if (state_options := self.state_options).from_state_text:
+            return state_options.option(state_val)
         else:
             return state_val
 
     @property
     def icon(self):  # pyright: ignore[reportIncompatibleMethodOverride]
         return "mdi:menu"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
-
-    @property
-    def device_info(self) -> DeviceInfo:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
@@ -0,0 +1,169 @@
+"""Snapshots of writable setpoints, to restore them after maintenance."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Collection
+from typing import TYPE_CHECKING, Any
+
+from aioecopanel import EcoPanelError
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    COMMANDABLE_OBJECT_TYPES,
+    DOMAIN,
+    LANE_BULK,
+    LOGGER,
+    RESTORE_CONCURRENCY,
+    STORAGE_VERSION,
+)
+from .models import BINARY_STATES, values_match
+
+if TYPE_CHECKING:
+    from .coordinator import EcoPanelDataUpdateCoordinator
+
+
+class SetpointSnapshots:
+    """Named snapshots of the presentValue of commandable objects."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: EcoPanelDataUpdateCoordinator
+    ) -> None:
+        """Initialize the snapshots of a config entry."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.{coordinator.config_entry.entry_id}.snapshots",
+        )
+        self._snapshots: dict[str, dict[str, Any]] | None = None
+
+    async def _async_snapshots(self) -> dict[str, dict[str, Any]]:
+        """Return the stored snapshots."""
+        if self._snapshots is None:
+            self._snapshots = await self._store.async_load() or {}
+
+        return self._snapshots
+
+    def _area_id(self, entity_id: str | None) -> str | None:
+        """Return the area of an entity, or of its device."""
+        if entity_id is None:
+            return None
+
+        if (entry := er.async_get(self.hass).async_get(entity_id)) is None:
+            return None
+
+        if entry.area_id is not None or entry.device_id is None:
+            return entry.area_id
+
+        device = dr.async_get(self.hass).async_get(entry.device_id)
+        return device.area_id if device is not None else None
+
+    async def async_snapshot(
+        self,
+        name: str,
+        deviceids: Collection[str] | None = None,
+        object_types: Collection[str] | None = None,
+        area_ids: Collection[str] | None = None,
+    ) -> dict[str, Any]:
+        """Capture the presentValue of every commandable object that matches."""
+        points: list[dict[str, Any]] = []
+
+        for deviceid, device in self.coordinator.data.devices.items():
+            if deviceids and deviceid not in deviceids:
+                continue
+
+            for objectid, obj in device.objects.items():
+                if not obj.objectIdentifier:
+                    continue
+
+                object_type = obj.objectIdentifier[0]
+                if object_type not in COMMANDABLE_OBJECT_TYPES or (
+                    object_types and object_type not in object_types
+                ):
+                    continue
+
+                entity_id = self.coordinator.addresses.entity_id(deviceid, objectid)
+                if area_ids and self._area_id(entity_id) not in area_ids:
+                    continue
+
+                if obj.presentValue is None:
+                    continue
+
+                points.append(
+                    {
+                        "device": deviceid,
+                        "object": objectid,
+                        "value": obj.presentValue,
+                        "entity_id": entity_id,
+                    }
+                )
+
+        snapshots = await self._async_snapshots()
+        snapshots[name] = {"created": dt_util.utcnow().isoformat(), "points": points}
+        await self._store.async_save(snapshots)
+
+        LOGGER.debug("Captured %s setpoints in snapshot %s", len(points), name)
+
+        return {"name": name, "points": len(points)}
+
+    async def async_restore(self, name: str, remove: bool = False) -> dict[str, Any]:
+        """Write the values of a snapshot back, skipping points already at them."""
+        snapshots = await self._async_snapshots()
+
+        if (snapshot := snapshots.get(name)) is None:
+            raise ServiceValidationError(f"There is no snapshot named {name}")
+
+        points = iter(snapshot["points"])
+        restored = 0
+        skipped = 0
+        failed: list[dict[str, str]] = []
+
+        async def worker() -> None:
+            nonlocal restored, skipped
+
+            for point in points:
+                deviceid, objectid = point["device"], point["object"]
+                value = point["value"]
+
+                if (device := self.coordinator.data.devices.get(deviceid)) is None or (
+                    obj := device.objects.get(objectid)
+                ) is None:
+                    failed.append({**point, "error": "Object no longer exists"})
+                    continue
+
+                if values_match(value, obj.presentValue):
+                    skipped += 1
+                    continue
+
+                if isinstance(value, str) and value.lower() in BINARY_STATES:
+                    # Written the same way as the switch entities do.
+                    value = BINARY_STATES[value.lower()]
+
+                try:
+                    await self.coordinator.async_write_property(
+                        deviceid,
+                        objectid,
+                        "presentValue",
+                        value,
+                        lane=LANE_BULK,
+                    )
+                except (EcoPanelError, HomeAssistantError) as err:
+                    # A full write queue fails the point, not the whole restore.
+                    failed.append({**point, "error": str(err)})
+                else:
+                    restored += 1
+
+        await asyncio.gather(*(worker() for _ in range(RESTORE_CONCURRENCY)))
+
+        if remove and not failed:
+            del snapshots[name]
+            await self._store.async_save(snapshots)
+
+        return {"name": name, "restored": restored, "skipped": skipped, "failed": failed}
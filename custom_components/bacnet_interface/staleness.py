@@ -0,0 +1,208 @@
+"""Detection of BACnet objects that stopped receiving updates."""
+
+from __future__ import annotations
+
+import asyncio
+from heapq import heappop, heappush
+from random import random
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    OBJECT_STALE_CHECK_SLACK,
+    OBJECT_STALE_JITTER,
+    OBJECT_STALE_MAX_INTERVAL,
+    OBJECT_STALE_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from .addresses import BACnetAddress
+    from .coordinator import EcoPanelDataUpdateCoordinator
+
+
+class StaleObjectTracker:
+    """Find objects with entities that had no update for too long.
+
+    Every tracked object has a single entry in a heap, ordered by the moment
+    it goes stale when nothing arrives before then. Updates do not touch the
+    heap: once an entry comes up, an object that was updated since is pushed
+    back with its new deadline, and only the others get refreshed. A single
+    timer waits for the first deadline, no matter how many objects there are.
+
+    When a refresh brings back what an object already had, the object is
+    quiet: it is flagged stale once another deadline passes without an update
+    of its own, and checked again at intervals that double every time, up to
+    OBJECT_STALE_MAX_INTERVAL.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: EcoPanelDataUpdateCoordinator
+    ) -> None:
+        """Initialize the tracker without any objects."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.timeout = OBJECT_STALE_TIMEOUT.total_seconds()
+        self.jitter = OBJECT_STALE_JITTER.total_seconds()
+        self.max_interval = OBJECT_STALE_MAX_INTERVAL.total_seconds()
+
+        self._heap: list[tuple[float, str, str]] = []
+        self._tracked: set[BACnetAddress] = set()
+        # Objects whose refresh came back unchanged, with their last update then
+        # and the number of unchanged refreshes since.
+        self._quiet: dict[BACnetAddress, tuple[float, int]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.refreshes = 0
+
+    @callback
+    def async_track(self, deviceid: str, objectid: str) -> None:
+        """Start tracking an object, if it is not tracked yet."""
+        if (deviceid, objectid) in self._tracked:
+            return
+
+        self._tracked.add((deviceid, objectid))
+
+        record = self.coordinator.records.get(deviceid, {}).get(objectid)
+        last_update = record.last_update if record is not None else monotonic()
+        heappush(
+            self._heap,
+            (last_update + self.timeout + random() * self.jitter, deviceid, objectid),
+        )
+
+        if self._heap[0][1:] == (deviceid, objectid):
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """Set the timer to the first deadline in the heap."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._heap:
+            self._timer = self.hass.loop.call_later(
+                max(0.0, self._heap[0][0] - monotonic()), self._async_expire
+            )
+
+    @callback
+    def _async_expire(self) -> None:
+        """Refresh the objects whose deadline passed without an update."""
+        self._timer = None
+        coordinator = self.coordinator
+        now = monotonic()
+        due: list[BACnetAddress] = []
+
+        while self._heap and self._heap[0][0] <= now + OBJECT_STALE_CHECK_SLACK:
+            _, deviceid, objectid = heappop(self._heap)
+            record = coordinator.records.get(deviceid, {}).get(objectid)
+
+            if record is None or not coordinator.has_object_listeners(
+                deviceid, objectid
+            ):
+                # The entities of the object were removed.
+                self._tracked.discard((deviceid, objectid))
+                self._quiet.pop((deviceid, objectid), None)
+                continue
+
+            quiet = self._quiet.get((deviceid, objectid))
+            if quiet is not None and record.last_update > quiet[0]:
+                # It sent an update of its own.
+                del self._quiet[(deviceid, objectid)]
+                quiet = None
+
+            if (
+                quiet is None
+                and (deadline := record.last_update + self.timeout) > now
+            ):
+                heappush(self._heap, (deadline, deviceid, objectid))
+                continue
+
+            if (
+                not coordinator.interface.connected
+                or deviceid in coordinator.unavailable_devices
+            ):
+                # Silence of all objects at once is handled per device.
+                heappush(self._heap, (now + self.timeout, deviceid, objectid))
+                continue
+
+            due.append((deviceid, objectid))
+
+        if due:
+            coordinator.config_entry.async_create_background_task(
+                self.hass,
+                self._async_refresh(due, now),
+                "bacnet-refresh-stale-objects",
+            )
+
+        self._schedule()
+
+    async def _async_refresh(
+        self, objects: list[BACnetAddress], started: float
+    ) -> None:
+        """Refresh stale objects, and flag those that still got no update."""
+        records = self.coordinator.records
+        previous = {
+            (deviceid, objectid): (record.value, record.status, record.last_update)
+            for deviceid, objectid in objects
+            if (record := records.get(deviceid, {}).get(objectid)) is not None
+        }
+
+        self.refreshes += len(objects)
+        await self.coordinator.async_refresh_objects(objects)
+
+        now = monotonic()
+
+        for deviceid, objectid in objects:
+            if (record := records.get(deviceid, {}).get(objectid)) is None:
+                self._tracked.discard((deviceid, objectid))
+                continue
+
+            value, status, last_update = previous.get(
+                (deviceid, objectid), (None, None, None)
+            )
+            interval = self.timeout
+
+            if record.last_update < started:
+                stale = True
+            elif (record.value, record.status) != (value, status):
+                self._quiet.pop((deviceid, objectid), None)
+                stale = False
+            else:
+                since, checks = self._quiet.get((deviceid, objectid), (None, -1))
+                # Quiet since the last refresh, a whole deadline without an
+                # update of its own.
+                stale = since == last_update
+                checks += 1
+                self._quiet[(deviceid, objectid)] = (record.last_update, checks)
+                interval = min(self.timeout * 2**checks, self.max_interval)
+
+            if stale and not record.stale:
+                record.stale = True
+                self.coordinator.async_update_device_listeners(deviceid, [objectid])
+
+            heappush(self._heap, (now + interval, deviceid, objectid))
+
+        self._schedule()
+
+    def shutdown(self) -> None:
+        """Stop the timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the number of tracked and stale objects for diagnostics."""
+        records = self.coordinator.records
+
+        return {
+            "tracked": len(self._tracked),
+            "stale": sum(
+                1
+                for deviceid, objectid in self._tracked
+                if (record := records.get(deviceid, {}).get(objectid)) is not None
+                and record.stale
+            ),
+            "quiet": len(self._quiet),
+            "refreshes": self.refreshes,
+        }
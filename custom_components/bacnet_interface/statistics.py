@@ -0,0 +1,241 @@
+"""Hourly long-term statistics compiled from BACnet samples."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+
+HOUR = timedelta(hours=1)
+
+
+def hour_start(timestamp: datetime) -> datetime:
+    """Return the start of the UTC hour a timestamp falls in."""
+    return dt_util.as_utc(timestamp).replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass(slots=True)
+class HourlyAggregate:
+    """Samples of a single hour, reduced to what the statistics need."""
+
+    start: datetime
+    count: int = 0
+    total: float = 0.0
+    min: float = field(default=float("inf"))
+    max: float = field(default=float("-inf"))
+    last: float = 0.0
+    weighted_total: float = 0.0
+    duration: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a sample to the hour."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.last = value
+
+    def integrate(self, value: float, seconds: float) -> None:
+        """Count a value as held for a number of seconds of the hour."""
+        self.weighted_total += value * seconds
+        self.duration += seconds
+
+    @property
+    def mean(self) -> float:
+        """Return the time weighted mean if known, else the mean of the samples."""
+        if self.duration:
+            return self.weighted_total / self.duration
+        return self.total / self.count
+
+
+def aggregate_hourly(
+    samples: Iterable[tuple[datetime, float]],
+) -> list[HourlyAggregate]:
+    """Group samples, ordered by time, into hourly aggregates."""
+    hours: list[HourlyAggregate] = []
+
+    for timestamp, value in samples:
+        start = hour_start(timestamp)
+        if not hours or hours[-1].start != start:
+            hours.append(HourlyAggregate(start))
+        hours[-1].add(value)
+
+    return hours
+
+
+def compile_statistics(
+    hours: Iterable[HourlyAggregate],
+    has_sum: bool,
+    last_state: float | None = None,
+    last_sum: float = 0.0,
+) -> list[StatisticData]:
+    """Compile hourly aggregates into recorder statistics.
+
+    Meters get a state and a growing sum, continuing from the last imported
+    state and sum. A meter that goes backwards is treated as a reset.
+    Other points get a mean, minimum and maximum.
+    """
+    statistics: list[StatisticData] = []
+
+    for hour in hours:
+        if not has_sum:
+            statistics.append(
+                StatisticData(
+                    start=hour.start, mean=hour.mean, min=hour.min, max=hour.max
+                )
+            )
+            continue
+
+        if last_state is None:
+            last_state = hour.last
+        elif hour.last < last_state:
+            last_sum += hour.last
+        else:
+            last_sum += hour.last - last_state
+
+        last_state = hour.last
+        statistics.append(StatisticData(start=hour.start, state=hour.last, sum=last_sum))
+
+    return statistics
+
+
+@dataclass(slots=True)
+class PointStatistics:
+    """Running statistics of a point that bypasses the state machine."""
+
+    metadata: StatisticMetaData
+    value: float | None = None
+    since: datetime | None = None
+    hour: HourlyAggregate | None = None
+    pending: list[HourlyAggregate] = field(default_factory=list)
+    last_state: float | None = None
+    last_sum: float = 0.0
+    loaded: bool = False
+
+    def add(self, value: float, timestamp: datetime) -> None:
+        """Add a sample, closing the current hour if it has passed."""
+        self.roll_over(timestamp)
+
+        if self.hour is None:
+            self.hour = HourlyAggregate(hour_start(timestamp))
+        elif self.value is not None and self.since is not None:
+            self.hour.integrate(self.value, (timestamp - self.since).total_seconds())
+
+        self.hour.add(value)
+        self.value = value
+        self.since = timestamp
+
+    def roll_over(self, timestamp: datetime) -> None:
+        """Close every hour before the one a timestamp falls in."""
+        start = hour_start(timestamp)
+
+        while self.hour is not None and self.hour.start < start:
+            end = self.hour.start + HOUR
+            if self.value is not None and self.since is not None:
+                self.hour.integrate(self.value, (end - self.since).total_seconds())
+            self.pending.append(self.hour)
+
+            if self.value is None:
+                self.hour = None
+                break
+
+            # The value carries over into the next hour.
+            self.hour = HourlyAggregate(end)
+            self.hour.add(self.value)
+            self.since = end
+
+
+class LiveStatistics:
+    """Compile hourly statistics of points in memory and import them directly.
+
+    Used for meters and fast process values whose every change would
+    otherwise go through the state machine and the recorder.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize without any points."""
+        self.hass = hass
+        self.points: dict[str, PointStatistics] = {}
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Import the statistics of every point shortly after each hour."""
+        return async_track_utc_time_change(
+            self.hass, self._async_import, minute=0, second=10
+        )
+
+    @callback
+    def async_add(
+        self,
+        statistic_id: str,
+        value: float,
+        has_sum: bool,
+        unit_of_measurement: str | None,
+    ) -> None:
+        """Add a sample of a point."""
+        if (point := self.points.get(statistic_id)) is None or (
+            point.metadata["has_sum"] != has_sum
+            or point.metadata["unit_of_measurement"] != unit_of_measurement
+        ):
+            point = self.points[statistic_id] = PointStatistics(
+                StatisticMetaData(
+                    has_mean=not has_sum,
+                    has_sum=has_sum,
+                    name=None,
+                    source="recorder",
+                    statistic_id=statistic_id,
+                    unit_of_measurement=unit_of_measurement,
+                )
+            )
+
+        point.add(value, dt_util.utcnow())
+
+    @callback
+    def async_remove(self, statistic_id: str) -> None:
+        """Stop compiling statistics of a point."""
+        self.points.pop(statistic_id, None)
+
+    async def _async_import(self, now: datetime) -> None:
+        """Import the hours that have passed of every point."""
+        if "recorder" not in self.hass.config.components:
+            return
+
+        for statistic_id, point in list(self.points.items()):
+            point.roll_over(now)
+            if not point.pending:
+                continue
+
+            if point.metadata["has_sum"] and not point.loaded:
+                last_stats = await get_instance(self.hass).async_add_executor_job(
+                    get_last_statistics,
+                    self.hass,
+                    1,
+                    statistic_id,
+                    False,
+                    {"state", "sum"},
+                )
+                if last_stat := last_stats.get(statistic_id):
+                    point.last_state = last_stat[0].get("state")
+                    point.last_sum = last_stat[0].get("sum") or 0.0
+                point.loaded = True
+
+            hours, point.pending = point.pending, []
+            statistics = compile_statistics(
+                hours, point.metadata["has_sum"], point.last_state, point.last_sum
+            )
+
+            if point.metadata["has_sum"]:
+                point.last_state = statistics[-1].get("state")
+                point.last_sum = statistics[-1].get("sum", 0.0)
+
+            async_import_statistics(self.hass, point.metadata, statistics)
@@ -1,15 +1,16 @@
+from collections.abc import Iterator
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ENABLED, CONF_NAME
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import CONF_BINARY_OUTPUT, CONF_BINARY_VALUE, DOMAIN, LOGGER
 from .coordinator import EcoPanelDataUpdateCoordinator
+from .entity import EcoPanelCommandableEntity, async_add_entities_chunked
 from .helper import key_to_property
 
 
@@ -20,15 +21,21 @@ async def async_setup_entry(
 ) -> None:
     """Set up EcoPanel sensor based on a config entry."""
     coordinator: EcoPanelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entity_list: list[Entity] = []
 
-    # Collect from all devices the objects that can become a sensor
-    for deviceid in coordinator.data.devices:
+    await async_add_entities_chunked(
+        coordinator, async_add_entities, _entities(coordinator)
+    )
+
+
+def _entities(coordinator: EcoPanelDataUpdateCoordinator) -> Iterator[Entity]:
+    """Yield an entity for every object that can become a switch."""
+    # Copied, as messages may add devices and objects between the chunks.
+    for deviceid in list(coordinator.data.devices):
         if not coordinator.data.devices[deviceid].objects:
             LOGGER.warning(f"No objects in {deviceid}!")
             continue
 
-        for objectid in coordinator.data.devices[deviceid].objects:
+        for objectid in list(coordinator.data.devices[deviceid].objects):
             if (
                 not coordinator.data.devices[deviceid]
                 .objects[objectid]
@@ -41,24 +48,19 @@ async def async_setup_entry(
                 coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
                 == "binaryValue"
             ):
-                entity_list.append(
-                    BinaryValueEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield BinaryValueEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
             elif (
                 coordinator.data.devices[deviceid].objects[objectid].objectIdentifier[0]
                 == "binaryOutput"
             ):
-                entity_list.append(
-                    BinaryOutputEntity(
-                        coordinator=coordinator, deviceid=deviceid, objectid=objectid
-                    )
+                yield BinaryOutputEntity(
+                    coordinator=coordinator, deviceid=deviceid, objectid=objectid
                 )
-    async_add_entities(entity_list)
 
 
-class BinaryValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], SwitchEntity):
+class BinaryValueEntity(EcoPanelCommandableEntity, SwitchEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -68,9 +70,7 @@ class BinaryValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Switch
         objectid: str,
     ):
         """Initialize a BACnet BinaryValue object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
 
     @property
     def unique_id(self) -> str:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -98,69 +98,12 @@ class BinaryValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Switch
 
     @property
     def is_on(self) -> bool | None:  # pyright: ignore[reportIncompatibleMethodOverride]
-        pres_val = (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
-
-        if isinstance(pres_val, str):
-            return pres_val in {"active", "1"}
-        elif isinstance(pres_val, int):
-            return pres_val == 1
-        elif isinstance(pres_val, bool):
-            return pres_val
-        else:
-            self.coordinator.logger.debug(
-                f"Unknown type for: {self.objectid} {
-                    self.coordinator.data.devices[self.deviceid]
-                    .objects[self.objectid]
-                    .presentValue
-                }"
-            )
+        return self.record.value
 
     @property
     def icon(self):  # pyright: ignore[reportIncompatibleMethodOverride]
         return "mdi:lightbulb-outline"
 
-    @property
-    def device_info(self) -> DeviceInfo:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
-
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Set BinaryValue object to active"""
 
@@ -168,13 +111,14 @@ class BinaryValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Switch
             CONF_BINARY_VALUE, "present_value"
         )
 
-        await self.coordinator.interface.write_property_v2(
+        await self.coordinator.async_write_property(
             deviceid=self.deviceid,
             objectid=self.objectid,
             propertyid=key_to_property(propertyid),
             value=1,
             array_index=None,
             priority=None,
+            wait_for_confirmation=self.write_confirmation,
         )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
@@ -184,19 +128,18 @@ class BinaryValueEntity(CoordinatorEntity[EcoPanelDataUpdateCoordinator], Switch
             CONF_BINARY_VALUE, "present_value"
         )
 
-        await self.coordinator.interface.write_property_v2(
+        await self.coordinator.async_write_property(
             deviceid=self.deviceid,
             objectid=self.objectid,
             propertyid=key_to_property(propertyid),
             value=0,
             array_index=None,
             priority=None,
+            wait_for_confirmation=self.write_confirmation,
         )
 
 
-class BinaryOutputEntity(
-    CoordinatorEntity[EcoPanelDataUpdateCoordinator], SwitchEntity
-):
+class BinaryOutputEntity(EcoPanelCommandableEntity, SwitchEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -206,9 +149,7 @@ class BinaryOutputEntity(
         objectid: str,
     ):
         """Initialize a BACnet BinaryOutput object as entity."""
-        super().__init__(coordinator=coordinator)
-        self.deviceid = deviceid
-        self.objectid = objectid
+        super().__init__(coordinator=coordinator, deviceid=deviceid, objectid=objectid)
 
     @property
     def unique_id(self) -> str:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -236,69 +177,12 @@ class BinaryOutputEntity(
 
     @property
     def is_on(self) -> bool | None:  # pyright: ignore[reportIncompatibleMethodOverride]
-        pres_val = (
-            self.coordinator.data.devices[self.deviceid]
-            .objects[self.objectid]
-            .presentValue
-        )
-
-        if isinstance(pres_val, str):
-            return pres_val in {"active", "1"}
-        elif isinstance(pres_val, int):
-            return pres_val == 1
-        elif isinstance(pres_val, bool):
-            return pres_val
-        else:
-            self.coordinator.logger.debug(
-                f"Unknown type for: {self.objectid} {
-                    self.coordinator.data.devices[self.deviceid]
-                    .objects[self.objectid]
-                    .presentValue
-                }"
-            )
+        return self.record.value
 
     @property
     def icon(self):  # pyright: ignore[reportIncompatibleMethodOverride]
         return "mdi:lightbulb-outline"
 
-    @property
-    def device_info(self) -> DeviceInfo:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.deviceid)},
-            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
-            manufacturer=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .vendorName,
-            model=self.coordinator.data.devices[self.deviceid]
-            .objects[self.deviceid]
-            .modelName,
-        )
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:  # pyright: ignore[reportIncompatibleMethodOverride]
-        return {
-            "inAlarm": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[0]
-            ),
-            "fault": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[1]
-            ),
-            "overridden": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[2]
-            ),
-            "outOfService": bool(
-                self.coordinator.data.devices[self.deviceid]
-                .objects[self.objectid]
-                .statusFlags[3]
-            ),
-        }
-
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Set BinaryOutput object to active"""
 
@@ -306,13 +190,14 @@ class BinaryOutputEntity(
             CONF_BINARY_OUTPUT, "present_value"
         )
 
-        await self.coordinator.interface.write_property_v2(
+        await self.coordinator.async_write_property(
             deviceid=self.deviceid,
             objectid=self.objectid,
             propertyid=key_to_property(propertyid),
             value=1,
             array_index=None,
             priority=None,
+            wait_for_confirmation=self.write_confirmation,
         )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
@@ -322,11 +207,12 @@ class BinaryOutputEntity(
             CONF_BINARY_OUTPUT, "present_value"
         )
 
-        await self.coordinator.interface.write_property_v2(
+        await self.coordinator.async_write_property(
             deviceid=self.deviceid,
             objectid=self.objectid,
             propertyid=key_to_property(propertyid),
             value=0,
             array_index=None,
             priority=None,
+            wait_for_confirmation=self.write_confirmation,
         )
@@ -0,0 +1,259 @@
+"""Backfill of BACnet trend log buffers into long-term statistics."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    get_last_statistics,
+)
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, STORAGE_VERSION
+from .helper import bacnet_to_ha_units, is_meter_unit
+from .statistics import aggregate_hourly, compile_statistics, hour_start
+
+if TYPE_CHECKING:
+    from .coordinator import EcoPanelDataUpdateCoordinator
+
+# logDatum choices that carry a value, as opposed to status or time changes.
+LOG_DATUM_VALUES = (
+    "realValue",
+    "unsignedValue",
+    "signedValue",
+    "enumValue",
+    "booleanValue",
+)
+
+
+def parse_timestamp(value: Any) -> datetime | None:
+    """Parse the timestamp of a log record, assuming local time if naive."""
+    if isinstance(value, dict) and "date" in value and "time" in value:
+        value = f"{value['date']}T{value['time']}"
+
+    if not isinstance(value, str) or (timestamp := dt_util.parse_datetime(value)) is None:
+        return None
+
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=dt_util.get_default_time_zone())
+
+    return timestamp
+
+
+def parse_log_record(record: Any) -> tuple[datetime, float] | None:
+    """Return the timestamp and value of a log record, if it holds a value."""
+    if not isinstance(record, dict):
+        return None
+
+    if (timestamp := parse_timestamp(record.get("timestamp"))) is None:
+        return None
+
+    datum = record.get("logDatum")
+    if isinstance(datum, dict):
+        datum = next(
+            (datum[choice] for choice in LOG_DATUM_VALUES if choice in datum), None
+        )
+
+    if isinstance(datum, bool | int | float):
+        return timestamp, float(datum)
+
+    return None
+
+
+class TrendLogBackfill:
+    """Import trend log buffers as hourly statistics of a sensor.
+
+    Only complete hours are imported. The sequence number of the last record
+    that was imported is stored per trend log, so a later import resumes
+    where the previous one stopped.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: EcoPanelDataUpdateCoordinator
+    ) -> None:
+        """Initialize the backfill of a config entry."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._store: Store[dict[str, int]] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.{coordinator.config_entry.entry_id}.trend_logs",
+        )
+        self._sequences: dict[str, int] | None = None
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _statistics_kind(self, entity_id: str, state: State) -> tuple[bool, str | None]:
+        """Return if the statistics of an entity keep a sum, and their unit.
+
+        A BACnet sensor decides from the units of its object, like its live
+        statistics do, as it has no state_class in the statistics-only mode.
+        """
+        if (address := self.coordinator.addresses.address(entity_id)) is not None:
+            deviceid, objectid = address
+            device = self.coordinator.data.devices.get(deviceid)
+            if device is not None and (obj := device.objects.get(objectid)):
+                unit = bacnet_to_ha_units(obj.units)
+                return is_meter_unit(unit), unit
+
+        return state.attributes.get("state_class") in (
+            SensorStateClass.TOTAL,
+            SensorStateClass.TOTAL_INCREASING,
+        ), state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+
+    async def _async_sequences(self) -> dict[str, int]:
+        """Return the last imported sequence number of each trend log."""
+        if self._sequences is None:
+            self._sequences = await self._store.async_load() or {}
+
+        return self._sequences
+
+    async def async_import(
+        self,
+        entity_id: str,
+        deviceid: str,
+        objectid: str,
+        page_size: int,
+    ) -> dict[str, Any]:
+        """Import the new records of a trend log into the statistics of an entity."""
+        key = f"{deviceid}/{objectid}"
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            return await self._async_import(entity_id, deviceid, objectid, key, page_size)
+
+    async def _async_import(
+        self,
+        entity_id: str,
+        deviceid: str,
+        objectid: str,
+        key: str,
+        page_size: int,
+    ) -> dict[str, Any]:
+        """Read a trend log buffer and import it page by page."""
+        if (state := self.hass.states.get(entity_id)) is None:
+            raise HomeAssistantError(f"Unknown entity: {entity_id}")
+
+        has_sum, unit = self._statistics_kind(entity_id, state)
+
+        total_record_count = await self.coordinator.async_read_property(
+            deviceid, objectid, "totalRecordCount", max_age=0
+        )
+        log_buffer = await self.coordinator.async_read_property(
+            deviceid, objectid, "logBuffer", max_age=0
+        )
+
+        if not isinstance(total_record_count, int) or not isinstance(log_buffer, list):
+            raise HomeAssistantError(f"{key} did not return a trend log buffer")
+
+        sequences = await self._async_sequences()
+        last_sequence = sequences.get(key, 0)
+
+        if last_sequence > total_record_count:
+            # The log was cleared or the sequence numbers wrapped around.
+            LOGGER.info("Sequence numbers of %s restarted, importing all", key)
+            last_sequence = 0
+
+        # The newest record in the buffer has sequence number totalRecordCount.
+        first_sequence = total_record_count - len(log_buffer) + 1
+        current_hour = hour_start(dt_util.utcnow())
+        samples: list[tuple[datetime, float]] = []
+        sample_sequences: list[int] = []
+
+        for sequence, record in enumerate(log_buffer, start=first_sequence):
+            if sequence <= last_sequence:
+                continue
+            if (sample := parse_log_record(record)) is None:
+                continue
+            if hour_start(sample[0]) >= current_hour:
+                break
+            samples.append(sample)
+            sample_sequences.append(sequence)
+
+        hours = aggregate_hourly(samples)
+
+        if not hours:
+            return {"imported": 0, "skipped": 0, "last_sequence": last_sequence}
+
+        # Sequence number of the last record of each hour.
+        last_in_hour = {
+            hour_start(timestamp): sequence
+            for (timestamp, _), sequence in zip(samples, sample_sequences)
+        }
+
+        last_state: float | None = None
+        last_sum = 0.0
+        skipped = 0
+
+        if has_sum:
+            last_stats = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics, self.hass, 1, entity_id, False, {"state", "sum"}
+            )
+            if last_stat := last_stats.get(entity_id):
+                last_state = last_stat[0].get("state")
+                last_sum = last_stat[0].get("sum") or 0.0
+
+                # Sums are cumulative, hours at or before existing statistics
+                # would offset the sums of every later hour. Only the hours
+                # after them are imported, continuing from the newest one.
+                last_start = dt_util.utc_from_timestamp(last_stat[0]["start"])
+                if hours[0].start <= last_start:
+                    newer = [hour for hour in hours if hour.start > last_start]
+                    skipped = len(hours) - len(newer)
+                    LOGGER.info(
+                        "Skipped %s hours of %s that are not newer than the"
+                        " statistics of %s",
+                        skipped,
+                        key,
+                        entity_id,
+                    )
+
+                    if not newer:
+                        sequences[key] = last_in_hour[hours[-1].start]
+                        self._store.async_delay_save(lambda: dict(sequences), 10)
+                        return {
+                            "imported": 0,
+                            "skipped": skipped,
+                            "last_sequence": sequences[key],
+                        }
+
+                    hours = newer
+
+        statistics = compile_statistics(hours, has_sum, last_state, last_sum)
+        metadata = StatisticMetaData(
+            has_mean=not has_sum,
+            has_sum=has_sum,
+            name=None,
+            source="recorder",
+            statistic_id=entity_id,
+            unit_of_measurement=unit,
+        )
+
+        hour_sequences = [last_in_hour[hour.start] for hour in hours]
+
+        iterator = iter(zip(statistics, hour_sequences))
+        while page := list(islice(iterator, page_size)):
+            async_import_statistics(
+                self.hass, metadata, [statistic for statistic, _ in page]
+            )
+            sequences[key] = page[-1][1]
+            self._store.async_delay_save(lambda: dict(sequences), 10)
+            # Let other work run between pages of a long buffer.
+            await asyncio.sleep(0)
+
+        LOGGER.debug("Imported %s hours of %s into %s", len(hours), key, entity_id)
+
+        return {
+            "imported": len(hours),
+            "skipped": skipped,
+            "last_sequence": sequences[key],
+        }
@@ -0,0 +1,116 @@
+"""Watchdog for synchronous work of the integration that blocks the event loop."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from math import inf
+from time import monotonic, perf_counter
+from typing import Any
+
+from .const import LOGGER, LOOP_WATCHDOG_THRESHOLD, LOOP_WATCHDOG_WARN_INTERVAL
+
+
+@dataclass(slots=True)
+class SectionStats:
+    """How long a section held the event loop."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    slow: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats for diagnostics."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4) if self.count else None,
+            "max": round(self.max, 4),
+            "slow": self.slow,
+        }
+
+
+class LoopWatchdog:
+    """Time the synchronous sections the integration runs on the event loop.
+
+    Opt-in, as timing every section costs a little. Sections that take longer
+    than the threshold are reported in a warning at most once per interval,
+    with the worst sections since the previous warning.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        threshold: float = LOOP_WATCHDOG_THRESHOLD,
+        warn_interval: float = LOOP_WATCHDOG_WARN_INTERVAL,
+    ) -> None:
+        """Initialize the watchdog without any sections."""
+        self.enabled = enabled
+        self.threshold = threshold
+        self.warn_interval = warn_interval
+
+        self.sections: dict[str, SectionStats] = {}
+        # Sections over the threshold since the last warning: (count, worst).
+        self._slow: dict[str, tuple[int, float]] = {}
+        self._last_warning = -inf
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Time a synchronous section, if the watchdog is enabled."""
+        if not self.enabled:
+            yield
+            return
+
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - started)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Count how long a section held the loop, and warn if it was too long."""
+        if (stats := self.sections.get(name)) is None:
+            stats = self.sections[name] = SectionStats()
+
+        stats.count += 1
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+
+        if seconds < self.threshold:
+            return
+
+        stats.slow += 1
+        count, worst = self._slow.get(name, (0, 0.0))
+        self._slow[name] = (count + 1, max(worst, seconds))
+
+        if (now := monotonic()) - self._last_warning < self.warn_interval:
+            return
+
+        self._last_warning = now
+        summary = ", ".join(
+            f"{section} {count}x up to {worst:.3f} s"
+            for section, (count, worst) in sorted(
+                self._slow.items(), key=lambda item: item[1][1], reverse=True
+            )
+        )
+        self._slow.clear()
+
+        LOGGER.warning(
+            "The event loop was blocked for more than %s s by: %s",
+            self.threshold,
+            summary,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the sections, worst first, for diagnostics."""
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "sections": {
+                name: stats.as_dict()
+                for name, stats in sorted(
+                    self.sections.items(), key=lambda item: item[1].max, reverse=True
+                )
+            },
+        }
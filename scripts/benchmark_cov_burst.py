@@ -0,0 +1,179 @@
+"""Measure event loop utilisation during a burst of websocket messages.
+
+Sets up the coordinator on a bare Home Assistant instance, with one listener
+per object that writes a state the way entities do, and replays a burst of
+COV messages like the add-on sends after a controller reboot. Every message
+goes through the decode and queue steps of the websocket receiver, once
+without coalescing and once for each coalescing window. Reports the share of
+the burst the event loop was busy, its longest lag and the listener wakeups.
+Needs Home Assistant and aioecopanel:
+
+    python scripts/benchmark_cov_burst.py --messages 5000 --duration 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_fan_out import analog_input, async_coordinator, build_site  # noqa: E402
+
+
+class LoopMeter:
+    """Time the event loop spends waiting in its selector, and its lag."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Wrap the selector of the loop."""
+        self.idle = 0.0
+        self.max_lag = 0.0
+        selector = loop._selector  # type: ignore[attr-defined]  # noqa: SLF001
+        select = selector.select
+
+        def timed_select(timeout: float | None = None) -> Any:
+            started = perf_counter()
+            try:
+                return select(timeout)
+            finally:
+                self.idle += perf_counter() - started
+
+        selector.select = timed_select
+
+    async def async_watch_lag(self, interval: float = 0.005) -> None:
+        """Measure how late a periodic sleep wakes up, until cancelled."""
+        while True:
+            started = perf_counter()
+            await asyncio.sleep(interval)
+            self.max_lag = max(self.max_lag, perf_counter() - started - interval)
+
+
+def _burst(
+    deviceids: list[str], messages: int, changed: int, objects: int
+) -> list[str]:
+    """Return the JSON of a burst of COV messages of random devices."""
+    burst = []
+    for round_ in range(messages):
+        numbers = random.sample(range(objects), changed)
+        burst.append(
+            json.dumps(
+                {
+                    random.choice(deviceids): {
+                        f"analogInput:{number}": analog_input(
+                            number, 20.0 + round_ % 10
+                        )
+                        for number in numbers
+                    }
+                }
+            )
+        )
+    return burst
+
+
+async def _main(
+    devices: int,
+    objects: int,
+    messages: int,
+    duration: float,
+    changed: int,
+    windows: list[int],
+) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = await async_coordinator(hass, build_site(devices, objects))
+        meter = LoopMeter(hass.loop)
+        wakeups = 0
+
+        for deviceid, device in coordinator.data.devices.items():
+            for objectid in device.objects:
+                entity_id = f"sensor.{deviceid}_{objectid}".replace(":", "_")
+                record = coordinator.records[deviceid][objectid]
+
+                def update_callback(
+                    entity_id: str = entity_id, record: Any = record
+                ) -> None:
+                    nonlocal wakeups
+                    wakeups += 1
+                    hass.states.async_set(entity_id, str(record.value))
+
+                coordinator.async_add_listener(update_callback, (deviceid, objectid))
+
+        random.seed(0)
+        burst = _burst(list(coordinator.data.devices), messages, changed, objects)
+
+        print(
+            f"{devices} devices of {objects} objects, {messages} messages of"
+            f" {changed} objects in {duration:g} s"
+        )
+
+        for window in windows:
+            coordinator.coalesce_window = window / 1000
+            wakeups = 0
+            lag = hass.loop.create_task(meter.async_watch_lag())
+            await asyncio.sleep(0.05)
+            meter.idle = meter.max_lag = 0.0
+
+            started = perf_counter()
+            sent = 0
+            while sent < messages:
+                # Every message that is due by now, spread evenly over the burst.
+                due = min(
+                    messages, int((perf_counter() - started) / duration * messages) + 1
+                )
+                for payload in burst[sent:due]:
+                    message_data, message_devices = (
+                        await coordinator._async_decode_devices(payload)  # noqa: SLF001
+                    )
+                    coordinator._async_queue_message(  # noqa: SLF001
+                        message_data, message_devices
+                    )
+                sent = due
+                await asyncio.sleep(0.001)
+            # Wait for the last window to be flushed.
+            while coordinator._flush_timer is not None:  # noqa: SLF001
+                await asyncio.sleep(0.001)
+            elapsed = perf_counter() - started
+            busy = 1 - meter.idle / elapsed
+
+            lag.cancel()
+            print(
+                f"window {window:>3} ms: loop busy {busy:6.1%} of {elapsed:5.2f} s,"
+                f" max lag {meter.max_lag * 1000:6.1f} ms,"
+                f" {wakeups:6d} wakeups"
+            )
+
+        coordinator.stale_objects.shutdown()
+        await coordinator.interface.session.close()
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--objects", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--changed", type=int, default=5)
+    parser.add_argument(
+        "--windows", type=int, nargs="+", default=[0, 50, 100, 250]
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        _main(
+            args.devices,
+            args.objects,
+            args.messages,
+            args.duration,
+            args.changed,
+            args.windows,
+        )
+    )
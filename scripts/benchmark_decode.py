@@ -0,0 +1,133 @@
+"""Measure how long decoding a full add-on payload blocks the event loop.
+
+Compares the old path, where aioecopanel decodes the payload with the json
+module and builds the devices on the event loop, with the integration's
+path, which decodes with orjson and builds the devices in the executor.
+Only needs CPython, orjson and aioecopanel:
+
+    python scripts/benchmark_decode.py --devices 10 --objects 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from statistics import median
+from typing import Any
+
+import orjson
+from aioecopanel.models import Device
+
+HEARTBEAT = 0.001
+
+
+def build_payload(devices: int, objects: int) -> bytes:
+    """Build a payload shaped like the add-on's /apiv1/json response."""
+    data: dict[str, Any] = {}
+    for device in range(devices):
+        deviceid = f"device:{1000 + device}"
+        device_data: dict[str, Any] = {
+            deviceid: {
+                "objectIdentifier": ["device", 1000 + device],
+                "objectName": f"Controller {device}",
+                "systemStatus": "operational",
+                "vendorName": "Vendor",
+                "modelName": "Model",
+            }
+        }
+        for number in range(objects):
+            device_data[f"analogValue:{number}"] = {
+                "objectIdentifier": ["analogValue", number],
+                "objectName": f"Point {number}",
+                "description": f"Description of point {number}",
+                "presentValue": number * 0.5,
+                "statusFlags": [0, 0, 0, 0],
+                "units": "degreesCelsius",
+                "outOfService": False,
+                "eventState": "normal",
+                "covIncrement": 0.1,
+                "priorityArray": [None] * 16,
+                "relinquishDefault": 20.0,
+            }
+        data[deviceid] = device_data
+    return json.dumps(data).encode()
+
+
+def _build_devices(data: dict[str, Any]) -> dict[str, Device]:
+    return {
+        deviceid: Device.update_device(deviceid, device_data)
+        for deviceid, device_data in data.items()
+        if deviceid and isinstance(device_data, dict)
+    }
+
+
+def _before(payload: bytes) -> None:
+    _build_devices(json.loads(payload.decode("utf8")))
+
+
+def _after(payload: bytes) -> dict[str, Device]:
+    return _build_devices(orjson.loads(payload))
+
+
+async def _longest_block(work: Any) -> float:
+    """Run work while a heartbeat measures the longest stall of the loop."""
+    longest = 0.0
+    running = True
+
+    async def heartbeat() -> None:
+        nonlocal longest
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while running:
+            await asyncio.sleep(HEARTBEAT)
+            now = loop.time()
+            longest = max(longest, now - last - HEARTBEAT)
+            last = now
+
+    task = asyncio.create_task(heartbeat())
+    await asyncio.sleep(HEARTBEAT * 5)
+    await work()
+    await asyncio.sleep(HEARTBEAT * 5)
+    running = False
+    await task
+    return longest
+
+
+async def _main(devices: int, objects: int, rounds: int) -> None:
+    payload = build_payload(devices, objects)
+    loop = asyncio.get_running_loop()
+    print(f"{devices * objects} points, {len(payload) / 1e6:.1f} MB payload")
+
+    async def before() -> None:
+        _before(payload)
+
+    async def orjson_inline() -> None:
+        _after(payload)
+
+    async def after() -> None:
+        devices = await loop.run_in_executor(None, _after, payload)
+        # Merging into the DeviceDict stays on the event loop.
+        merged: dict[str, Device] = {}
+        for deviceid, device in devices.items():
+            merged[deviceid] = device
+
+    for name, work in (
+        ("before", before),
+        ("orjson inline", orjson_inline),
+        ("after", after),
+    ):
+        blocks = [await _longest_block(work) for _ in range(rounds)]
+        print(
+            f"{name:>13}: longest event loop block median {median(blocks) * 1000:.1f} ms, "
+            f"max {max(blocks) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--objects", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_main(args.devices, args.objects, args.rounds))
@@ -0,0 +1,154 @@
+"""Measure entity setup time and device registry writes.
+
+Adds the analog input entities of a site to an entity platform on a bare
+Home Assistant instance, with fresh registries every time. Once the way the
+entities did it before, with a full DeviceInfo built from the device object
+for every entity, and once the way they do it now, with the devices
+registered in a single pass and entities that only refer to their device.
+Counts the device registry calls and the saves they scheduled. Needs Home
+Assistant and aioecopanel:
+
+    python scripts/benchmark_device_registry.py --devices 201 --objects 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.const import CONF_ENABLED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmark_fan_out import async_coordinator, build_site  # noqa: E402
+
+from custom_components.bacnet_interface.const import DOMAIN  # noqa: E402
+from custom_components.bacnet_interface.sensor import (  # noqa: E402
+    AnalogInputEntity,
+)
+
+
+class OldAnalogInputEntity(AnalogInputEntity):
+    """Analog input with the DeviceInfo it built before the bulk registration."""
+
+    @property
+    def device_info(self) -> DeviceInfo:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.deviceid)},
+            name=f"{self.coordinator.data.devices[self.deviceid].objects[self.deviceid].objectName}",
+            manufacturer=self.coordinator.data.devices[self.deviceid]
+            .objects[self.deviceid]
+            .vendorName,
+            model=self.coordinator.data.devices[self.deviceid]
+            .objects[self.deviceid]
+            .modelName,
+        )
+
+
+async def _async_measure(
+    data: dict[str, Any], bulk: bool
+) -> tuple[int, float, dict[str, int]]:
+    """Add all analog inputs, and return their number, the time and the calls."""
+    calls = {"get_or_create": 0, "update_device": 0, "saves": 0}
+
+    def counted(name: str, method: Any) -> Any:
+        def call(self: Any, *args: Any, **kwargs: Any) -> Any:
+            calls[name] += 1
+            return method(self, *args, **kwargs)
+
+        return call
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config_entries = ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        coordinator = await async_coordinator(
+            hass, data, entry_data={CONF_ENABLED: True}
+        )
+        hass.config_entries._entries[coordinator.config_entry.entry_id] = (  # noqa: SLF001
+            coordinator.config_entry
+        )
+
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(__name__),
+            domain="sensor",
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        platform.config_entry = coordinator.config_entry
+        entity_class = AnalogInputEntity if bulk else OldAnalogInputEntity
+
+        with (
+            patch.object(
+                dr.DeviceRegistry,
+                "async_get_or_create",
+                counted("get_or_create", dr.DeviceRegistry.async_get_or_create),
+            ),
+            patch.object(
+                dr.DeviceRegistry,
+                "async_update_device",
+                counted("update_device", dr.DeviceRegistry.async_update_device),
+            ),
+            patch.object(
+                dr.DeviceRegistry,
+                "async_schedule_save",
+                counted("saves", dr.DeviceRegistry.async_schedule_save),
+            ),
+        ):
+            started = perf_counter()
+            if bulk:
+                coordinator.async_register_devices()
+            entities = [
+                entity_class(coordinator, deviceid, objectid)
+                for deviceid, device in coordinator.data.devices.items()
+                for objectid in device.objects
+                if objectid.startswith("analogInput:")
+            ]
+            await platform.async_add_entities(entities)
+            elapsed = perf_counter() - started
+            assert len(hass.states.async_entity_ids("sensor")) == len(entities)
+
+        await platform.async_reset()
+        coordinator.stale_objects.shutdown()
+        await coordinator.interface.session.close()
+        await hass.async_stop(force=True)
+
+    return len(entities), elapsed, calls
+
+
+async def _main(devices: int, objects: int) -> None:
+    data = build_site(devices, objects)
+
+    for name, bulk in (("per entity", False), ("bulk", True)):
+        entities, elapsed, calls = await _async_measure(data, bulk)
+        print(
+            f"{name:>10}: {entities} entities in {elapsed:6.2f} s,"
+            f" {calls['get_or_create']} get_or_create,"
+            f" {calls['update_device']} update_device,"
+            f" {calls['saves']} scheduled saves"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=201)
+    parser.add_argument("--objects", type=int, default=25)
+    args = parser.parse_args()
+    asyncio.run(_main(args.devices, args.objects))
@@ -0,0 +1,170 @@
+"""Measure the fan-out of websocket messages from one noisy BACnet device.
+
+Sets up the coordinator on a bare Home Assistant instance, with one listener
+per object the way entities register them, and feeds it messages of a single
+noisy device among many quiet ones. Compares the old fan-out, where every
+message ended in async_set_updated_data and woke every listener, with the
+per-device fan-out of _async_merge_message. The listeners only count their
+calls, entities that write their state make every wakeup cost more. Needs
+Home Assistant and aioecopanel:
+
+    python scripts/benchmark_fan_out.py --devices 201 --objects 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aioecopanel import DeviceDict  # noqa: E402
+
+from custom_components.bacnet_interface.const import DOMAIN  # noqa: E402
+from custom_components.bacnet_interface.coordinator import (  # noqa: E402
+    EcoPanelDataUpdateCoordinator,
+)
+
+
+def analog_input(number: int, value: float) -> dict[str, Any]:
+    """Return the properties of an analog input as the add-on sends them."""
+    return {
+        "objectIdentifier": ["analogInput", number],
+        "objectName": f"Point {number}",
+        "presentValue": value,
+        "statusFlags": [False, False, False, False],
+        "units": "degreesCelsius",
+        "outOfService": False,
+        "eventState": "normal",
+    }
+
+
+def build_site(devices: int, objects: int) -> dict[str, Any]:
+    """Build device data shaped like the add-on's /apiv1/json response."""
+    data: dict[str, Any] = {}
+    for device in range(devices):
+        deviceid = f"device:{1000 + device}"
+        device_data: dict[str, Any] = {
+            deviceid: {
+                "objectIdentifier": ["device", 1000 + device],
+                "objectName": f"Controller {device}",
+                "systemStatus": "operational",
+                "vendorName": "Vendor",
+                "modelName": "Model",
+            }
+        }
+        for number in range(objects):
+            device_data[f"analogInput:{number}"] = analog_input(number, 20.0)
+        data[deviceid] = device_data
+    return data
+
+
+async def async_coordinator(
+    hass: HomeAssistant,
+    data: dict[str, Any],
+    host: str = "127.0.0.1",
+    port: int = 8099,
+    entry_data: dict[str, Any] | None = None,
+) -> EcoPanelDataUpdateCoordinator:
+    """Create a coordinator that already holds device data, without the add-on."""
+    await dr.async_load(hass)
+    await er.async_load(hass)
+
+    entry = config_entries.ConfigEntry(
+        data={CONF_HOST: host, CONF_PORT: port, **(entry_data or {})},
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source=config_entries.SOURCE_USER,
+        title="Benchmark",
+        unique_id=None,
+        version=1,
+    )
+    config_entries.current_entry.set(entry)
+
+    coordinator = EcoPanelDataUpdateCoordinator(hass, entry)
+    coordinator.data = DeviceDict(data)
+    coordinator.last_update_success = True
+    for deviceid, device in coordinator.data.devices.items():
+        coordinator._update_records(deviceid, device)  # noqa: SLF001
+
+    return coordinator
+
+
+def _message(deviceid: str, round_: int, changed: int) -> dict[str, Any]:
+    """Return a message with new present values of a few objects of a device."""
+    return {
+        deviceid: {
+            f"analogInput:{number}": analog_input(number, 20.0 + round_ % 10)
+            for number in range(changed)
+        }
+    }
+
+
+async def _main(devices: int, objects: int, messages: int, changed: int) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = await async_coordinator(hass, build_site(devices, objects))
+
+        listeners = wakeups = 0
+
+        def update_callback() -> None:
+            nonlocal wakeups
+            wakeups += 1
+
+        for deviceid, device in coordinator.data.devices.items():
+            for objectid in device.objects:
+                coordinator.async_add_listener(update_callback, (deviceid, objectid))
+                listeners += 1
+
+        noisy = next(iter(coordinator.data.devices))
+
+        def old(message: dict[str, Any]) -> None:
+            coordinator.data.update_from_data(message)
+            DataUpdateCoordinator.async_set_updated_data(coordinator, coordinator.data)
+
+        def new(message: dict[str, Any]) -> None:
+            coordinator._async_merge_message(message)  # noqa: SLF001
+
+        print(
+            f"{devices} devices, {listeners} listeners, {messages} messages"
+            f" of {changed} objects of one device"
+        )
+
+        for name, handle in (("global", old), ("per device", new)):
+            wakeups = 0
+            started = perf_counter()
+            for round_ in range(messages):
+                handle(_message(noisy, round_, changed))
+            elapsed = perf_counter() - started
+            print(
+                f"{name:>10}: {wakeups / messages:8.0f} wakeups and"
+                f" {elapsed / messages * 1000:7.3f} ms per message"
+            )
+
+        coordinator.stale_objects.shutdown()
+        await coordinator.interface.session.close()
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=201)
+    parser.add_argument("--objects", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--changed", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_main(args.devices, args.objects, args.messages, args.changed))
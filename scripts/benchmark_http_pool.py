@@ -0,0 +1,103 @@
+"""Measure write throughput through the connection pool of the add-on session.
+
+Runs the stand-in add-on of benchmark_write_paths, answering every REST write
+after a request delay, and sends concurrent presentValue writes to it through
+the interface of the coordinator. Once on the session of the integration with
+its own pool, and once on the shared session of Home Assistant. The write
+scheduler is left out, it would cap the throughput at its rate. Needs Home
+Assistant and aioecopanel:
+
+    python scripts/benchmark_http_pool.py --writes 2000 --concurrency 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from time import perf_counter
+
+from aiohttp import web
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_fan_out import async_coordinator, build_site  # noqa: E402
+from benchmark_write_paths import DEVICE, StandInAddOn  # noqa: E402
+
+OBJECTS = 50
+
+
+async def _main(writes: int, concurrency: int, request_delay: float) -> None:
+    site = build_site(1, OBJECTS)
+    add_on = StandInAddOn(site, 0, request_delay)
+    runner = web.AppRunner(add_on.app)
+    await runner.setup()
+    server = web.TCPSite(runner, "127.0.0.1", 0)
+    await server.start()
+    port = server._server.sockets[0].getsockname()[1]  # noqa: SLF001
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = await async_coordinator(hass, site, port=port)
+        interface = coordinator.interface
+        own_session = interface.session
+
+        print(
+            f"{writes} presentValue writes, {concurrency} at a time,"
+            f" request delay {request_delay * 1000:g} ms,"
+            f" pool limit {coordinator.http_pool.limit}"
+        )
+
+        for name, session in (
+            ("own pool", own_session),
+            ("shared", async_get_clientsession(hass)),
+        ):
+            interface.session = session
+
+            async def writer(queue: Iterator[int]) -> None:
+                for number in queue:
+                    await interface.write_property_v2(
+                        deviceid=DEVICE,
+                        objectid=f"analogInput:{number % OBJECTS}",
+                        propertyid="presentValue",
+                        value=float(number % 2),
+                        array_index=None,
+                        priority=None,
+                    )
+
+            # Open the connections before timing.
+            warm_up = iter(range(concurrency))
+            await asyncio.gather(*(writer(warm_up) for _ in range(concurrency)))
+
+            queue = iter(range(writes))
+            started = perf_counter()
+            await asyncio.gather(*(writer(queue) for _ in range(concurrency)))
+            elapsed = perf_counter() - started
+            print(f"{name:>8}: {writes / elapsed:8.0f} writes/s")
+
+        print(f"own pool stats: {coordinator.http_pool.as_dict()}")
+
+        interface.session = own_session
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--request-delay",
+        type=float,
+        default=0.005,
+        help="seconds the add-on takes to answer a write",
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.writes, args.concurrency, args.request_delay))
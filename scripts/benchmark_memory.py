@@ -0,0 +1,82 @@
+"""Measure the memory per BACnet point of the data the integration keeps.
+
+Compares the aioecopanel objects as the library builds them on its own with
+what the integration keeps: the objects as it builds them, plus an
+ObjectRecord per object. Needs the dependencies of the integration:
+
+    python scripts/benchmark_memory.py --points 10000 50000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+from aioecopanel.models import Device
+from benchmark_decode import build_payload
+
+from custom_components.bacnet_interface.models import ObjectRecord, compact_object
+
+OBJECTS_PER_DEVICE = 1000
+
+
+def _library(payload: bytes) -> Any:
+    """Build the devices like aioecopanel does on its own."""
+    data = json.loads(payload.decode("utf8"))
+    return {
+        deviceid: Device.update_device(deviceid, device_data)
+        for deviceid, device_data in data.items()
+    }
+
+
+def _integration(payload: bytes) -> Any:
+    """Build the devices and records like the integration does."""
+    data = orjson.loads(payload)
+    devices = {}
+    records: dict[str, dict[str, ObjectRecord]] = {}
+
+    for deviceid, device_data in data.items():
+        devices[deviceid] = device = Device.update_device(deviceid, device_data)
+        for obj in device.objects.values():
+            compact_object(obj)
+        records[deviceid] = {
+            objectid: ObjectRecord.from_object(objectid, obj, 0.0)
+            for objectid, obj in device.objects.items()
+        }
+
+    return devices, records
+
+
+def _memory(build: Callable[[bytes], Any], payload: bytes) -> int:
+    """Return the bytes still allocated by what build keeps."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build(payload)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main(points: list[int]) -> None:
+    for count in points:
+        payload = build_payload(max(1, count // OBJECTS_PER_DEVICE), OBJECTS_PER_DEVICE)
+        total = max(1, count // OBJECTS_PER_DEVICE) * OBJECTS_PER_DEVICE
+        library = _memory(_library, payload) / total
+        integration = _memory(_integration, payload) / total
+        print(
+            f"{total:>7} points: aioecopanel {library:.0f} B/point,"
+            f" integration {integration:.0f} B/point ({integration - library:+.0f})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[10000, 50000, 100000])
+    main(parser.parse_args().points)
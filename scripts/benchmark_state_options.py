@@ -0,0 +1,171 @@
+"""Measure the option lookups of multistate entities with many states.
+
+Compares the lookups as the select entities did them before the option
+tables, rebuilding the option list from stateText or numberOfStates on every
+access and finding the value of an option with list.index, with the option
+table the entities now keep per object. The selected option is the last one,
+the worst case for list.index. Needs Home Assistant and aioecopanel:
+
+    python scripts/benchmark_state_options.py --states 16 128 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from timeit import Timer
+from types import SimpleNamespace
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aioecopanel import Device, Object  # noqa: E402
+
+from custom_components.bacnet_interface.const import STATETEXT_OFFSET  # noqa: E402
+from custom_components.bacnet_interface.entity import EcoPanelEntity  # noqa: E402
+
+DEVICE = "device:1000"
+OBJECT = "multiStateValue:1"
+
+
+def multistate_object(states: int, state_text: bool) -> Object:
+    """Return a multistate value with stateText, or only numberOfStates."""
+    device = Device.update_device(
+        DEVICE,
+        {
+            OBJECT: {
+                "objectIdentifier": ["multiStateValue", 1],
+                "objectName": "Mode",
+                "presentValue": states,
+                "numberOfStates": states,
+                "stateText": (
+                    [f"State {number}" for number in range(1, states + 1)]
+                    if state_text
+                    else None
+                ),
+            }
+        },
+    )
+    return device.objects[OBJECT]
+
+
+def old_options(self: Any) -> list:
+    """Return the options the way the entities built them on every access."""
+    if (
+        state_text := self.coordinator.data.devices[self.deviceid]
+        .objects[self.objectid]
+        .stateText
+    ):
+        if any(state_text):
+            return state_text
+
+    if (
+        number_of_states := self.coordinator.data.devices[self.deviceid]
+        .objects[self.objectid]
+        .numberOfStates
+    ):
+        return [str(i) for i in range(1, number_of_states + 1)]
+
+    return []
+
+
+def old_current_option(self: Any) -> str:
+    """Return the current option the way the entities looked it up."""
+    pres_val = int(
+        self.coordinator.data.devices[self.deviceid].objects[self.objectid].presentValue
+    )
+
+    if (
+        state_text := self.coordinator.data.devices[self.deviceid]
+        .objects[self.objectid]
+        .stateText
+    ):
+        if any(state_text):
+            return state_text[pres_val - STATETEXT_OFFSET]
+    if (
+        number_of_states := self.coordinator.data.devices[self.deviceid]
+        .objects[self.objectid]
+        .numberOfStates
+    ):
+        options = [str(i) for i in range(1, number_of_states + 1)]
+        return options[pres_val - STATETEXT_OFFSET]
+    return str(pres_val)
+
+
+def new_current_option(self: Any) -> str | None:
+    """Return the current option from the option table of the entity."""
+    pres_val = (
+        self.coordinator.data.devices[self.deviceid].objects[self.objectid].presentValue
+    )
+
+    if not (state_options := self.state_options).options:
+        return str(pres_val)
+
+    return state_options.option(pres_val)
+
+
+class _Entity(SimpleNamespace):
+    """Stand-in for an entity, with what the option lookups read."""
+
+    state_options = EcoPanelEntity.state_options
+
+
+def _entity(obj: Object) -> Any:
+    """Return a stand-in entity of an object."""
+    return _Entity(
+        coordinator=SimpleNamespace(
+            data=SimpleNamespace(devices={DEVICE: Device({OBJECT: obj})})
+        ),
+        deviceid=DEVICE,
+        objectid=OBJECT,
+        _state_options=None,
+    )
+
+
+def _time(statement: Any, number: int) -> float:
+    """Return the best time of a call in microseconds."""
+    return min(Timer(statement).repeat(5, number)) / number * 1e6
+
+
+def main(states: list[int], number: int) -> None:
+    print(f"microseconds per call, best of 5 runs of {number}")
+    print(
+        f"{'states':>6} {'source':>10} | {'options':>15} | {'current':>15}"
+        f" | {'select':>15}"
+    )
+    print(f"{'':>17} |" + " |".join([f" {'old':>7} {'new':>7}"] * 3))
+
+    for count in states:
+        for state_text in (True, False):
+            obj = multistate_object(count, state_text)
+            entity = _entity(obj)
+            option = old_options(entity)[-1]
+
+            results = (
+                _time(lambda: old_options(entity), number),
+                _time(lambda: entity.state_options.options, number),
+                _time(lambda: old_current_option(entity), number),
+                _time(lambda: new_current_option(entity), number),
+                _time(
+                    lambda: old_options(entity).index(option) + STATETEXT_OFFSET,
+                    number,
+                ),
+                _time(lambda: entity.state_options.values[option], number),
+            )
+            source = "stateText" if state_text else "number"
+            print(
+                f"{count:>6} {source:>10} | "
+                + " | ".join(
+                    f"{old:7.3f} {new:7.3f}"
+                    for old, new in zip(results[::2], results[1::2])
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--states", type=int, nargs="+", default=[16, 128, 512])
+    parser.add_argument("--number", type=int, default=10000)
+    args = parser.parse_args()
+    main(args.states, args.number)
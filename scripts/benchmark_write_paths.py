@@ -0,0 +1,168 @@
+"""Measure write latency over the websocket and over the REST API.
+
+Runs a local stand-in for the add-on: it serves /apiv1/json, takes writes
+on /apiv2 and on the websocket, and sends the COV of every write back over
+the websocket after an optional device delay. The coordinator writes a
+presentValue over and over, waiting for its confirmation, once over the
+websocket and once through the REST fallback. Needs Home Assistant and
+aioecopanel:
+
+    python scripts/benchmark_write_paths.py --writes 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+from statistics import quantiles
+from typing import Any
+
+from aiohttp import WSMsgType, web
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_fan_out import async_coordinator, build_site  # noqa: E402
+
+DEVICE = "device:1000"
+OBJECT = "analogInput:0"
+
+
+class StandInAddOn:
+    """Answer the add-on API from device data kept in memory."""
+
+    def __init__(
+        self, data: dict[str, Any], device_delay: float, request_delay: float = 0
+    ) -> None:
+        """Initialize with the data of the site."""
+        self.data = data
+        self.device_delay = device_delay
+        self.request_delay = request_delay
+        self.sockets: set[web.WebSocketResponse] = set()
+        self.app = web.Application()
+        self.app.router.add_get("/apiv1/json", self._handle_json)
+        self.app.router.add_post("/apiv2/{device}/{object}/{property}", self._handle_write)
+        self.app.router.add_get("/ws", self._handle_websocket)
+
+    async def _handle_json(self, request: web.Request) -> web.Response:
+        return web.json_response(self.data)
+
+    async def _handle_write(self, request: web.Request) -> web.Response:
+        if self.request_delay:
+            await asyncio.sleep(self.request_delay)
+        value = request.query.get("value")
+        self._write(
+            request.match_info["device"],
+            request.match_info["object"],
+            request.match_info["property"],
+            float(value) if value is not None else None,
+        )
+        return web.json_response({})
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self.sockets.add(socket)
+
+        try:
+            async for message in socket:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                for deviceid, objects in message.json().items():
+                    for objectid, properties in objects.items():
+                        for propertyid, value in properties.items():
+                            self._write(deviceid, objectid, propertyid, value)
+        finally:
+            self.sockets.discard(socket)
+
+        return socket
+
+    def _write(self, deviceid: str, objectid: str, propertyid: str, value: Any) -> None:
+        """Take a write, and send its COV once the device processed it."""
+        obj = self.data[deviceid][objectid]
+        obj[propertyid] = value
+        asyncio.get_running_loop().create_task(
+            self._async_send_cov({deviceid: {objectid: dict(obj)}})
+        )
+
+    async def _async_send_cov(self, message: dict[str, Any]) -> None:
+        if self.device_delay:
+            await asyncio.sleep(self.device_delay)
+        for socket in list(self.sockets):
+            await socket.send_json(message)
+
+
+def _percentiles(latencies: list[float]) -> str:
+    cuts = quantiles(latencies, n=100)
+    return f"p50 {cuts[49] * 1000:6.2f} ms, p99 {cuts[98] * 1000:6.2f} ms"
+
+
+async def _main(writes: int, device_delay: float) -> None:
+    site = build_site(1, 10)
+    add_on = StandInAddOn(site, device_delay)
+    runner = web.AppRunner(add_on.app)
+    await runner.setup()
+    server = web.TCPSite(runner, "127.0.0.1", 0)
+    await server.start()
+    port = server._server.sockets[0].getsockname()[1]  # noqa: SLF001
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = await async_coordinator(hass, site, port=port)
+        coordinator._use_websocket()  # noqa: SLF001
+        while not coordinator.interface.connected:
+            await asyncio.sleep(0.01)
+
+        websocket_write = coordinator._async_websocket_write  # noqa: SLF001
+
+        async def websocket_down(confirmation: Any) -> bool:
+            return False
+
+        print(
+            f"{writes} confirmed presentValue writes per path,"
+            f" device delay {device_delay * 1000:g} ms"
+        )
+
+        for name, path_write in (
+            ("websocket", websocket_write),
+            ("REST", websocket_down),
+        ):
+            coordinator._async_websocket_write = path_write  # noqa: SLF001
+            latencies = []
+            for number in range(writes):
+                latency = await coordinator.async_write_property(
+                    DEVICE,
+                    OBJECT,
+                    "presentValue",
+                    float(number % 2),
+                    wait_for_confirmation=5,
+                )
+                assert latency is not None
+                latencies.append(latency)
+            print(f"{name:>9}: {_percentiles(latencies)}")
+
+        paths = {
+            path: histogram.count
+            for path, histogram in coordinator.write_path_latency.items()
+        }
+        print(f"writes per path: {paths}")
+
+        await coordinator.async_shutdown()
+        await coordinator.interface.disconnect()
+        await coordinator.interface.session.close()
+        await hass.async_stop(force=True)
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument(
+        "--device-delay", type=float, default=0, help="seconds until the COV is sent"
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.writes, args.device_delay))
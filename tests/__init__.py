@@ -0,0 +1 @@
+"""Tests of the Bepacom BACnet/IP integration."""
@@ -0,0 +1,9 @@
+"""Fixtures of the Bepacom BACnet/IP integration tests."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading the integration from custom_components."""
+    return
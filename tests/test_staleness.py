@@ -0,0 +1,116 @@
+"""Tests of the detection of stale BACnet objects."""
+
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.bacnet_interface import staleness
+from custom_components.bacnet_interface.models import ObjectRecord
+from custom_components.bacnet_interface.staleness import StaleObjectTracker
+
+DEVICE = "device:1000"
+POINT = "analogValue:1"
+
+
+class Clock:
+    """Monotonic time that only moves when the test moves it."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the time."""
+        return self.now
+
+
+def _tracker(
+    hass: HomeAssistant, clock: Clock
+) -> tuple[StaleObjectTracker, ObjectRecord, MagicMock]:
+    """Return a tracker of a point whose refresh brings back the same value."""
+    record = ObjectRecord("analogValue", value=21.0)
+    coordinator = MagicMock()
+    coordinator.records = {DEVICE: {POINT: record}}
+    coordinator.unavailable_devices = {}
+    coordinator.interface.connected = True
+    coordinator.has_object_listeners.return_value = True
+    coordinator.config_entry.async_create_background_task.side_effect = (
+        lambda hass, target, name: hass.async_create_task(target)
+    )
+
+    async def refresh_objects(objects: list[tuple[str, str]]) -> None:
+        record.last_update = clock()
+        record.stale = False
+
+    coordinator.async_refresh_objects.side_effect = refresh_objects
+
+    return StaleObjectTracker(hass, coordinator), record, coordinator
+
+
+async def _expire(hass: HomeAssistant, tracker: StaleObjectTracker) -> None:
+    """Run the check of the deadlines that passed, and the refresh it starts."""
+    # In place of the timer, which waits for the real time.
+    tracker.shutdown()
+    tracker._async_expire()  # noqa: SLF001
+    await hass.async_block_till_done()
+
+
+async def test_quiet_object_goes_stale(hass: HomeAssistant) -> None:
+    """An unchanged refresh, then nothing for 2x the deadline, flags it stale."""
+    clock = Clock()
+
+    with (
+        patch.object(staleness, "monotonic", clock),
+        patch.object(staleness, "random", return_value=0.0),
+    ):
+        tracker, record, coordinator = _tracker(hass, clock)
+        timeout = tracker.timeout
+        tracker.async_track(DEVICE, POINT)
+
+        clock.now = timeout
+        await _expire(hass, tracker)
+        assert tracker.refreshes == 1
+        assert not record.stale
+        assert tracker.as_dict()["quiet"] == 1
+
+        clock.now = 2 * timeout
+        await _expire(hass, tracker)
+        assert tracker.refreshes == 2
+        assert record.stale
+        coordinator.async_update_device_listeners.assert_called_once_with(
+            DEVICE, [POINT]
+        )
+
+        # Still checked, at twice the interval.
+        assert tracker._heap[0][0] == 4 * timeout  # noqa: SLF001
+        clock.now = 4 * timeout
+        await _expire(hass, tracker)
+        assert tracker.refreshes == 3
+        assert record.stale
+
+        tracker.shutdown()
+
+
+async def test_quiet_object_with_update_is_not_stale(hass: HomeAssistant) -> None:
+    """An update of its own after an unchanged refresh keeps an object fresh."""
+    clock = Clock()
+
+    with (
+        patch.object(staleness, "monotonic", clock),
+        patch.object(staleness, "random", return_value=0.0),
+    ):
+        tracker, record, _ = _tracker(hass, clock)
+        timeout = tracker.timeout
+        tracker.async_track(DEVICE, POINT)
+
+        clock.now = timeout
+        await _expire(hass, tracker)
+
+        record.last_update = 1.5 * timeout
+        clock.now = 2 * timeout
+        await _expire(hass, tracker)
+        assert tracker.refreshes == 1
+        assert not record.stale
+        assert tracker.as_dict()["quiet"] == 0
+
+        tracker.shutdown()
@@ -0,0 +1,92 @@
+"""Tests of the trend log backfill into long-term statistics."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.bacnet_interface.trendlog import TrendLogBackfill
+
+DEVICE = "device:1000"
+POINT = "analogInput:1"
+TREND_LOG = "trendLog:1"
+
+
+def _coordinator(units: str) -> MagicMock:
+    """Return a coordinator whose entity reads a point in the given units."""
+    coordinator = MagicMock()
+    coordinator.config_entry.entry_id = "entry"
+    coordinator.addresses.address.return_value = (DEVICE, POINT)
+    coordinator.data.devices = {
+        DEVICE: MagicMock(objects={POINT: MagicMock(units=units)})
+    }
+
+    # One record every 20 minutes during the three hours before this one.
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    log_buffer = [
+        {
+            "timestamp": (start - timedelta(minutes=20 * number)).isoformat(),
+            "logDatum": {"realValue": 100.0 - number},
+        }
+        for number in range(9, 0, -1)
+    ]
+    properties = {"totalRecordCount": len(log_buffer), "logBuffer": log_buffer}
+
+    async def read_property(
+        deviceid: str, objectid: str, propertyid: str, **kwargs: Any
+    ) -> Any:
+        return properties[propertyid]
+
+    coordinator.async_read_property = read_property
+    return coordinator
+
+
+async def _import(hass: HomeAssistant, coordinator: MagicMock) -> MagicMock:
+    """Import the trend log and return the mock that received the statistics."""
+    recorder = MagicMock(async_add_executor_job=AsyncMock(return_value={}))
+
+    with (
+        patch(
+            "custom_components.bacnet_interface.trendlog.get_instance",
+            return_value=recorder,
+        ),
+        patch(
+            "custom_components.bacnet_interface.trendlog.async_import_statistics"
+        ) as import_statistics,
+    ):
+        result = await TrendLogBackfill(hass, coordinator).async_import(
+            "sensor.point", DEVICE, TREND_LOG, 100
+        )
+
+    assert result["imported"] == 3
+    return import_statistics
+
+
+async def test_meter_in_statistics_only_mode_imports_sums(hass: HomeAssistant) -> None:
+    """A meter without state_class, as in the statistics-only mode, gets sums."""
+    hass.states.async_set(
+        "sensor.point", "100", {ATTR_UNIT_OF_MEASUREMENT: UnitOfEnergy.KILO_WATT_HOUR}
+    )
+
+    import_statistics = await _import(hass, _coordinator("kilowattHours"))
+
+    metadata = import_statistics.call_args.args[1]
+    assert metadata["has_sum"] is True
+    assert metadata["has_mean"] is False
+    assert metadata["unit_of_measurement"] == UnitOfEnergy.KILO_WATT_HOUR
+    assert all("sum" in statistic for statistic in import_statistics.call_args.args[2])
+
+
+async def test_measurement_imports_means(hass: HomeAssistant) -> None:
+    """A point that is not a meter gets means, whatever its state says."""
+    hass.states.async_set("sensor.point", "21", {ATTR_UNIT_OF_MEASUREMENT: "°C"})
+
+    import_statistics = await _import(hass, _coordinator("degreesCelsius"))
+
+    metadata = import_statistics.call_args.args[1]
+    assert metadata["has_sum"] is False
+    assert metadata["has_mean"] is True
+    assert all("mean" in statistic for statistic in import_statistics.call_args.args[2])